@@ -2,46 +2,124 @@
 SQLite caching for API data
 """
 
+import io
 import sqlite3
 import json
+import threading
+import time
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import timedelta
 from pathlib import Path
-from typing import Optional, Any, Dict
+from typing import Optional, Any, Dict, Tuple
 import pickle
 
 from config import CACHE_TTL
 
 
+class _ParquetFrame:
+    """Pickle-friendly holder for a DataFrame stored as Parquet bytes."""
+
+    __slots__ = ("payload",)
+
+    def __init__(self, payload: bytes):
+        self.payload = payload
+
+
+def _pack(value: Any) -> Any:
+    """Replace DataFrames in a (nested dict) cache value with Parquet blobs."""
+    if isinstance(value, pd.DataFrame):
+        buf = io.BytesIO()
+        value.to_parquet(buf, compression="zstd")
+        return _ParquetFrame(buf.getvalue())
+    if isinstance(value, dict):
+        return {k: _pack(v) for k, v in value.items()}
+    return value
+
+
+def _unpack(value: Any) -> Any:
+    """Inverse of _pack: rebuild DataFrames from their Parquet blobs."""
+    if isinstance(value, _ParquetFrame):
+        return pd.read_parquet(io.BytesIO(value.payload))
+    if isinstance(value, dict):
+        return {k: _unpack(v) for k, v in value.items()}
+    return value
+
+
+# table -> (unix-seconds timestamp column, column definitions)
+_TABLES = {
+    "cache": ("timestamp", """
+        key TEXT PRIMARY KEY,
+        data BLOB,
+        timestamp INTEGER,
+        ttl INTEGER
+    """),
+    "hits": ("ts", """
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        ts INTEGER NOT NULL,
+        path TEXT NOT NULL,
+        referrer TEXT,
+        visitor TEXT,
+        utm_source TEXT,
+        utm_campaign TEXT
+    """),
+}
+
+
+def _migrate_timestamps(conn: sqlite3.Connection, table: str, ts_col: str,
+                        columns: str, names: list):
+    """Rebuild a table whose ISO-text timestamps predate unix-second storage."""
+    conn.execute(f"ALTER TABLE {table} RENAME TO {table}_old")
+    conn.execute(f"CREATE TABLE {table} ({columns})")
+    # Old values were naive local-time ISO strings
+    select = ", ".join(
+        f"CAST(strftime('%s', {name}, 'utc') AS INTEGER)" if name == ts_col else name
+        for name in names
+    )
+    conn.execute(f"INSERT INTO {table} ({', '.join(names)}) SELECT {select} FROM {table}_old")
+    conn.execute(f"DROP TABLE {table}_old")
+
+
 class CacheManager:
     """Manages SQLite-based caching for API data."""
 
-    def __init__(self, db_path: str = "cache.db"):
+    def __init__(self, db_path: str = "cache.db", memory_size: int = 64):
         self.db_path = Path(__file__).parent.parent / db_path
+        # In-process layer in front of SQLite: key -> (monotonic expiry, value)
+        self._mem: Dict[str, Tuple[float, Any]] = {}
+        self._mem_size = memory_size
+        self._lock = threading.Lock()
         self._init_db()
 
+    def _mem_get(self, key: str) -> Optional[Any]:
+        """Return a live in-memory entry, dropping it if expired."""
+        with self._lock:
+            hit = self._mem.get(key)
+            if hit is None:
+                return None
+            expires_at, value = hit
+            if time.monotonic() >= expires_at:
+                del self._mem[key]
+                return None
+            return value
+
+    def _mem_set(self, key: str, value: Any, ttl: float):
+        """Store an entry in memory, evicting the oldest when full."""
+        with self._lock:
+            self._mem.pop(key, None)
+            if len(self._mem) >= self._mem_size:
+                del self._mem[next(iter(self._mem))]
+            self._mem[key] = (time.monotonic() + ttl, value)
+
     def _init_db(self):
         """Initialize the cache database."""
         with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS cache (
-                    key TEXT PRIMARY KEY,
-                    data BLOB,
-                    timestamp TEXT,
-                    ttl INTEGER
-                )
-            """)
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS hits (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    ts TEXT NOT NULL,
-                    path TEXT NOT NULL,
-                    referrer TEXT,
-                    visitor TEXT,
-                    utm_source TEXT,
-                    utm_campaign TEXT
-                )
-            """)
+            for table, (ts_col, columns) in _TABLES.items():
+                conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({columns})")
+                col_types = {
+                    row[1]: row[2] for row in conn.execute(f"PRAGMA table_info({table})")
+                }
+                if col_types.get(ts_col, "").upper() == "TEXT":
+                    _migrate_timestamps(conn, table, ts_col, columns, list(col_types))
             conn.commit()
 
     def get(self, key: str) -> Optional[Any]:
@@ -49,6 +127,10 @@ class CacheManager:
         Get cached data if not expired.
         Returns None if not found or expired.
         """
+        value = self._mem_get(key)
+        if value is not None:
+            return value
+
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.execute(
                 "SELECT data, timestamp, ttl FROM cache WHERE key = ?",
@@ -59,16 +141,18 @@ class CacheManager:
             if not row:
                 return None
 
-            data_blob, timestamp_str, ttl = row
-            cached_time = datetime.fromisoformat(timestamp_str)
+            data_blob, timestamp, ttl = row
+            age = time.time() - timestamp
 
-            if datetime.now() - cached_time > timedelta(seconds=ttl):
+            if age > ttl:
                 # Expired
                 conn.execute("DELETE FROM cache WHERE key = ?", (key,))
                 conn.commit()
                 return None
 
-            return pickle.loads(data_blob)
+            value = _unpack(pickle.loads(data_blob))
+            self._mem_set(key, value, ttl - age)
+            return value
 
     def set(self, key: str, data: Any, ttl: Optional[int] = None):
         """
@@ -78,15 +162,17 @@ class CacheManager:
         if ttl is None:
             ttl = 3600
 
-        data_blob = pickle.dumps(data)
+        data_blob = pickle.dumps(_pack(data))
 
         with sqlite3.connect(self.db_path) as conn:
             conn.execute("""
                 INSERT OR REPLACE INTO cache (key, data, timestamp, ttl)
                 VALUES (?, ?, ?, ?)
-            """, (key, data_blob, datetime.now().isoformat(), ttl))
+            """, (key, data_blob, int(time.time()), ttl))
             conn.commit()
 
+        self._mem_set(key, data, ttl)
+
     def get_age(self, key: str) -> Optional[timedelta]:
         """Get the age of a cached item."""
         with sqlite3.connect(self.db_path) as conn:
@@ -99,17 +185,20 @@ class CacheManager:
             if not row:
                 return None
 
-            cached_time = datetime.fromisoformat(row[0])
-            return datetime.now() - cached_time
+            return timedelta(seconds=time.time() - row[0])
 
     def invalidate(self, key: str):
         """Remove a specific cache entry."""
+        with self._lock:
+            self._mem.pop(key, None)
         with sqlite3.connect(self.db_path) as conn:
             conn.execute("DELETE FROM cache WHERE key = ?", (key,))
             conn.commit()
 
     def invalidate_all(self):
         """Clear entire cache."""
+        with self._lock:
+            self._mem.clear()
         with sqlite3.connect(self.db_path) as conn:
             conn.execute("DELETE FROM cache")
             conn.commit()
@@ -120,13 +209,13 @@ class CacheManager:
         with sqlite3.connect(self.db_path) as conn:
             conn.execute(
                 "INSERT INTO hits (ts, path, referrer, visitor, utm_source, utm_campaign) VALUES (?, ?, ?, ?, ?, ?)",
-                (datetime.now().isoformat(), path, referrer, visitor, utm_source, utm_campaign),
+                (int(time.time()), path, referrer, visitor, utm_source, utm_campaign),
             )
             conn.commit()
 
     def get_analytics(self, days: int = 7) -> Dict[str, Any]:
         """Get analytics summary for the last N days."""
-        cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+        cutoff = int(time.time()) - days * 86400
         with sqlite3.connect(self.db_path) as conn:
             conn.row_factory = sqlite3.Row
 
@@ -154,7 +243,7 @@ class CacheManager:
             ).fetchall()
 
             by_day = conn.execute(
-                "SELECT DATE(ts) as day, COUNT(*) as c, COUNT(DISTINCT visitor) as u FROM hits WHERE ts >= ? GROUP BY DATE(ts) ORDER BY day",
+                "SELECT DATE(ts, 'unixepoch', 'localtime') as day, COUNT(*) as c, COUNT(DISTINCT visitor) as u FROM hits WHERE ts >= ? GROUP BY day ORDER BY day",
                 (cutoff,),
             ).fetchall()
 
@@ -171,7 +260,11 @@ class CacheManager:
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
         with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("SELECT key, timestamp, ttl FROM cache")
+            # Let SQLite compute entry ages from the integer timestamps
+            cursor = conn.execute(
+                "SELECT key, ? - timestamp, ttl FROM cache",
+                (int(time.time()),)
+            )
             rows = cursor.fetchall()
 
             stats = {
@@ -179,24 +272,22 @@ class CacheManager:
                 "entries": {}
             }
 
-            for key, timestamp_str, ttl in rows:
-                cached_time = datetime.fromisoformat(timestamp_str)
-                age = datetime.now() - cached_time
-                expires_in = timedelta(seconds=ttl) - age
+            for key, age_seconds, ttl in rows:
+                expires_in = ttl - age_seconds
 
                 stats["entries"][key] = {
-                    "age_seconds": age.total_seconds(),
-                    "age_human": _format_timedelta(age),
-                    "expires_in_seconds": max(0, expires_in.total_seconds()),
-                    "expires_in_human": _format_timedelta(expires_in) if expires_in.total_seconds() > 0 else "expired"
+                    "age_seconds": age_seconds,
+                    "age_human": _format_timedelta(age_seconds),
+                    "expires_in_seconds": max(0, expires_in),
+                    "expires_in_human": _format_timedelta(expires_in) if expires_in > 0 else "expired"
                 }
 
             return stats
 
 
-def _format_timedelta(td: timedelta) -> str:
-    """Format timedelta as human-readable string."""
-    total_seconds = int(td.total_seconds())
+def _format_timedelta(seconds: float) -> str:
+    """Format a duration in seconds as human-readable string."""
+    total_seconds = int(seconds)
 
     if total_seconds < 60:
         return f"{total_seconds}s"
@@ -4,6 +4,8 @@ FlowState API - FastAPI backend for the liquidity regime dashboard.
 
 import os
 import json
+import asyncio
+from contextlib import asynccontextmanager
 from pathlib import Path
 from datetime import datetime
 from typing import Optional
@@ -12,6 +14,7 @@ from dotenv import load_dotenv
 load_dotenv()
 
 import hashlib
+import hmac
 
 from fastapi import FastAPI, HTTPException, Header, Request
 from fastapi.middleware.cors import CORSMiddleware
@@ -28,12 +31,25 @@ from scoring.regime import determine_regime
 from scoring.explanations import generate_explanation
 from config import CACHE_TTL, REGIME_THRESHOLDS, WEIGHTS
 import subscriber_db
+import subscriber_db_pg
+# The JSON fallback shares subscribers.py's in-memory store and background
+# writer, so its edits and add_subscribers can't overwrite each other
+import subscribers as subscriber_store
 
 # ---------------------------------------------------------------------------
 # App setup
 # ---------------------------------------------------------------------------
 
-app = FastAPI(title="FlowState API", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create per-worker resources once the worker process has started."""
+    app.state.cache = CacheManager()
+    await subscriber_db_pg.init_pool()
+    yield
+    await subscriber_db_pg.close_pool()
+
+
+app = FastAPI(title="FlowState API", version="1.0.0", lifespan=lifespan)
 
 FRONTEND_URL = os.environ.get("FRONTEND_URL", "http://localhost:3000")
 
@@ -52,7 +68,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-CACHE = CacheManager()
 ANALYTICS_SALT = os.environ.get("ANALYTICS_SALT", "flowstate-2026")
 
 
@@ -68,7 +83,7 @@ async def track_hits(request: Request, call_next):
         utm_source = request.query_params.get("utm_source", "")
         utm_campaign = request.query_params.get("utm_campaign", "")
         try:
-            CACHE.log_hit(path, referrer, visitor, utm_source, utm_campaign)
+            app.state.cache.log_hit(path, referrer, visitor, utm_source, utm_campaign)
         except Exception:
             pass
     return response
@@ -76,9 +91,9 @@ async def track_hits(request: Request, call_next):
 
 STATE_FILE = Path(__file__).parent / "regime_state.json"
 FEEDBACK_FILE = Path(__file__).parent / "feedback.json"
-SUBSCRIBERS_FILE = Path(__file__).parent / "subscribers.json"
 ADMIN_PASSWORD = os.environ.get("ADMIN_PASSWORD", "")
 ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN", "")
+_EXPECTED_ADMIN = f"Bearer {ADMIN_TOKEN}".encode()
 
 # ---------------------------------------------------------------------------
 # Pydantic models
@@ -211,7 +226,7 @@ def verify_admin(authorization: Optional[str]) -> bool:
     """Verify admin authorization header."""
     if not authorization:
         return False
-    return authorization == f"Bearer {ADMIN_TOKEN}"
+    return hmac.compare_digest(authorization.encode(), _EXPECTED_ADMIN)
 
 
 # ---------------------------------------------------------------------------
@@ -228,31 +243,33 @@ async def get_dashboard(force_refresh: bool = False):
 
     # Load data with caching
     if force_refresh:
-        CACHE.invalidate_all()
+        app.state.cache.invalidate_all()
 
-    cached_data = CACHE.get("all_data")
+    cached_data = app.state.cache.get("all_data")
     if cached_data:
         data = cached_data
     else:
         data = fetch_all_data()
-        CACHE.set("all_data", data, ttl=min(CACHE_TTL.values()))
+        app.state.cache.set("all_data", data, ttl=min(CACHE_TTL.values()))
 
-    metrics = calculate_metrics(data)
-    scores = calculate_scores(metrics)
-    regime, state, regime_info = determine_regime(scores, state_file=STATE_FILE)
+    async def score():
+        metrics = await asyncio.to_thread(calculate_metrics, data)
+        scores = calculate_scores(metrics)
+        regime, _, regime_info = await asyncio.to_thread(
+            determine_regime, scores, state_file=STATE_FILE
+        )
+        return metrics, scores, regime, regime_info
+
+    # Chart extraction only needs the raw data, so overlap it with scoring.
+    # gather() retrieves whichever result is left over if the other fails.
+    charts, (metrics, scores, regime, regime_info) = await asyncio.gather(
+        asyncio.to_thread(get_chart_data, data), score()
+    )
     explanation = generate_explanation(regime, scores, metrics, regime_info)
-    charts = get_chart_data(data)
 
-    # Days in regime from state file
+    # Days in regime from regime state
     days_in_regime = regime_info.get("days_in_regime", 0)
-    regime_start_date = None
-    try:
-        if STATE_FILE.exists():
-            with open(STATE_FILE, "r") as f:
-                st = json.load(f)
-                regime_start_date = st.get("regime_start_date")
-    except Exception:
-        pass
+    regime_start_date = regime_info.get("regime_start_date")
 
     btc = metrics.get("btc", {})
 
@@ -296,9 +313,19 @@ MAX_SUBSCRIBERS = 100
 @app.get("/api/spots")
 async def get_spots():
     """Get remaining subscriber spots."""
-    if not subscriber_db.is_configured():
+    if subscriber_db_pg.is_configured():
+        try:
+            subscriber_count, waitlist_count = await asyncio.gather(
+                subscriber_db_pg.get_subscriber_count(),
+                subscriber_db_pg.get_waitlist_count(),
+            )
+        except subscriber_db.SupabaseError as e:
+            print(f"Postgres error in get_spots: {e}")
+            subscriber_count = 0
+            waitlist_count = 0
+    elif not subscriber_db.is_configured():
         # Fallback to JSON file if Supabase not configured
-        data = load_json_file(SUBSCRIBERS_FILE)
+        data = subscriber_store.snapshot_subscribers()
         if not data:
             data = {"subscribers": [], "waitlist": []}
         subscriber_count = len(data.get("subscribers", []))
@@ -334,19 +361,17 @@ async def subscribe(req: SubscribeRequest):
         raise HTTPException(status_code=400, detail="Invalid cadence")
 
     # Use Supabase if configured, otherwise fall back to JSON
-    if subscriber_db.is_configured():
+    if subscriber_db_pg.is_configured() or subscriber_db.is_configured():
         try:
-            success, message, data = subscriber_db.atomic_subscribe(email, cadence, MAX_SUBSCRIBERS)
+            if subscriber_db_pg.is_configured():
+                success, message, data = await subscriber_db_pg.atomic_subscribe(email, cadence, MAX_SUBSCRIBERS)
+            else:
+                success, message, data = subscriber_db.atomic_subscribe(email, cadence, MAX_SUBSCRIBERS)
 
             # Send confirmation email for new subscribers (not waitlist, not already existed)
             if success and not data.get("already_existed") and not data.get("waitlisted"):
-                try:
-                    from subscribers import send_confirmation_email
-                    result = send_confirmation_email(email, cadence)
-                    if not result:
-                        print(f"Warning: Confirmation email to {email} was not sent")
-                except Exception as e:
-                    print(f"Error sending confirmation email: {e}")
+                from subscribers import enqueue_confirmation_email
+                enqueue_confirmation_email(email, cadence)
 
             return {
                 "success": success,
@@ -363,7 +388,7 @@ async def subscribe(req: SubscribeRequest):
             )
 
     # Fallback to JSON file storage
-    data = load_json_file(SUBSCRIBERS_FILE)
+    data = subscriber_store.snapshot_subscribers()
     if not data:
         data = {"subscribers": [], "waitlist": []}
 
@@ -386,15 +411,10 @@ async def subscribe(req: SubscribeRequest):
             "subscribed_at": datetime.now().isoformat(),
             "confirmed": False,
         })
-        save_json_file(SUBSCRIBERS_FILE, data)
+        subscriber_store.save_subscribers(data)
 
-        try:
-            from subscribers import send_confirmation_email
-            result = send_confirmation_email(email, cadence)
-            if not result:
-                print(f"Warning: Confirmation email to {email} was not sent")
-        except Exception as e:
-            print(f"Error sending confirmation email: {e}")
+        from subscribers import enqueue_confirmation_email
+        enqueue_confirmation_email(email, cadence)
 
         return {
             "success": True,
@@ -408,7 +428,7 @@ async def subscribe(req: SubscribeRequest):
             "cadence": cadence,
             "added_at": datetime.now().isoformat(),
         })
-        save_json_file(SUBSCRIBERS_FILE, data)
+        subscriber_store.save_subscribers(data)
 
         return {
             "success": True,
@@ -456,7 +476,7 @@ async def get_subscribers(authorization: Optional[str] = Header(None)):
         except subscriber_db.SupabaseError as e:
             raise HTTPException(status_code=503, detail=f"Database error: {e}")
 
-    data = load_json_file(SUBSCRIBERS_FILE)
+    data = subscriber_store.snapshot_subscribers()
     return data.get("subscribers", [])
 
 
@@ -474,7 +494,7 @@ async def delete_subscriber_endpoint(email: str, authorization: Optional[str] =
         except subscriber_db.SupabaseError as e:
             raise HTTPException(status_code=503, detail=f"Database error: {e}")
 
-    data = load_json_file(SUBSCRIBERS_FILE)
+    data = subscriber_store.snapshot_subscribers()
     if not data:
         raise HTTPException(status_code=404, detail="Subscriber not found")
 
@@ -485,7 +505,7 @@ async def delete_subscriber_endpoint(email: str, authorization: Optional[str] =
     if len(data["subscribers"]) == original_count:
         raise HTTPException(status_code=404, detail="Subscriber not found")
 
-    save_json_file(SUBSCRIBERS_FILE, data)
+    subscriber_store.save_subscribers(data)
     return {"success": True}
 
 
@@ -523,10 +543,10 @@ async def send_test_briefing(req: TestBriefingRequest, authorization: Optional[s
 
     try:
         # Fetch live data
-        cached_data = CACHE.get("all_data")
+        cached_data = app.state.cache.get("all_data")
         if not cached_data:
             cached_data = fetch_all_data()
-            CACHE.set("all_data", cached_data, ttl=min(CACHE_TTL.values()))
+            app.state.cache.set("all_data", cached_data, ttl=min(CACHE_TTL.values()))
 
         metrics = calculate_metrics(cached_data)
         scores = calculate_scores(metrics)
@@ -563,13 +583,13 @@ async def get_analytics(
     """Get hit analytics (admin only)."""
     if not verify_admin(authorization):
         raise HTTPException(status_code=401, detail="Unauthorized")
-    return CACHE.get_analytics(days=days)
+    return app.state.cache.get_analytics(days=days)
 
 
 @app.post("/api/refresh")
 async def force_refresh():
     """Force cache invalidation and re-fetch."""
-    CACHE.invalidate_all()
+    app.state.cache.invalidate_all()
     return {"success": True, "message": "Cache cleared"}
 
 
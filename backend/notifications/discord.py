@@ -2,9 +2,10 @@
 Discord webhook notifications for regime alerts and daily briefings.
 """
 
+import json
+import time
 import requests
-from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Union
 
 # Regime colors for Discord embeds (decimal format)
 REGIME_COLORS = {
@@ -35,9 +36,37 @@ METRIC_NAMES = {
     "stablecoin": "Stablecoin Flows",
 }
 
+# Shared session so repeated webhook posts reuse the TCP/TLS connection
+_SESSION = requests.Session()
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def _utc_timestamp() -> str:
+    """Current UTC time as an ISO 8601 string for embed timestamps."""
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+
+def _post_payload(webhook_url: Union[str, List[str]], payload: Dict[str, Any]) -> bool:
+    """
+    Encode a webhook payload once and post the same bytes to each webhook.
+    Returns True only if every webhook accepted it.
+    """
+    urls = [webhook_url] if isinstance(webhook_url, str) else webhook_url
+    body = json.dumps(payload).encode("utf-8")
+
+    ok = True
+    for url in urls:
+        try:
+            response = _SESSION.post(url, data=body, headers=_JSON_HEADERS, timeout=10)
+            ok = ok and response.status_code == 204
+        except Exception as e:
+            print(f"Discord webhook error: {e}")
+            ok = False
+    return ok
+
 
 def send_daily_briefing(
-    webhook_url: str,
+    webhook_url: Union[str, List[str]],
     regime: str,
     score: float,
     metrics: Dict[str, Any],
@@ -93,21 +122,15 @@ def send_daily_briefing(
         "footer": {
             "text": "Daily macro liquidity check"
         },
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": _utc_timestamp(),
     }
     
     payload = {"embeds": [embed]}
-    
-    try:
-        response = requests.post(webhook_url, json=payload, timeout=10)
-        return response.status_code == 204
-    except Exception as e:
-        print(f"Discord webhook error: {e}")
-        return False
+    return _post_payload(webhook_url, payload)
 
 
 def send_regime_change_alert(
-    webhook_url: str,
+    webhook_url: Union[str, List[str]],
     old_regime: str,
     new_regime: str,
     score: float,
@@ -147,7 +170,7 @@ def send_regime_change_alert(
         "footer": {
             "text": "Liquidity regime shift detected"
         },
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": _utc_timestamp(),
     }
 
     # Add @here mention for urgency
@@ -155,10 +178,4 @@ def send_regime_change_alert(
         "content": "Heads up — macro liquidity regime just changed:",
         "embeds": [embed]
     }
-    
-    try:
-        response = requests.post(webhook_url, json=payload, timeout=10)
-        return response.status_code == 204
-    except Exception as e:
-        print(f"Discord webhook error: {e}")
-        return False
+    return _post_payload(webhook_url, payload)
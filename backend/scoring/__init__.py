@@ -1,3 +1,3 @@
-from .engine import calculate_scores
+from .engine import calculate_scores, calculate_scores_batch
 from .regime import determine_regime, RegimeState
 from .explanations import generate_explanation
@@ -0,0 +1,34 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Optional compiled scoring kernel, same contract as engine._score_loop.
+
+Build in place with:  cythonize -i scoring/_kernel.pyx
+engine.py uses it when the extension is importable and otherwise falls
+back to numba, then NumPy.
+"""
+
+import numpy as np
+
+
+def score_kernel(const double[:] deltas, const double[:] accels, const double[:, :] thresholds):
+    """Score direction-normalised inputs; NaN compares False -> 0."""
+    cdef Py_ssize_t i, n = deltas.shape[0]
+    scores = np.zeros(n, dtype=np.int8)
+    accel_flags = np.zeros(n, dtype=np.int8)
+    cdef signed char[:] s = scores
+    cdef signed char[:] a = accel_flags
+    cdef double d, x
+
+    with nogil:
+        for i in range(n):
+            d = deltas[i]
+            if d >= thresholds[i, 0]:
+                s[i] = 1
+            elif d <= thresholds[i, 1]:
+                s[i] = -1
+            x = accels[i]
+            if x > 0:
+                a[i] = 1
+            elif x < 0:
+                a[i] = -1
+    return scores, accel_flags
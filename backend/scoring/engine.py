@@ -2,33 +2,232 @@
 Core scoring logic for each metric
 """
 
-from typing import Dict, Any, Tuple
+import numpy as np
+import pandas as pd
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple
 from config import WEIGHTS, METRIC_THRESHOLDS
 
+try:
+    from numba import njit
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+
+# Fixed metric order shared by the score and weight vectors
+_METRIC_KEYS = ("walcl", "rrp", "hy_spread", "dxy", "stablecoin")
+_METRIC_INDEX = {key: i for i, key in enumerate(_METRIC_KEYS)}
+_WEIGHTS_VEC = np.array([WEIGHTS[k] for k in _METRIC_KEYS], dtype=np.float64)
+_MAX_POSSIBLE = float(_WEIGHTS_VEC.sum())
+_MIN_POSSIBLE = -_MAX_POSSIBLE
+
+# Thresholds bound once at import so scorers skip the dict lookups
+_WALCL_BULL = METRIC_THRESHOLDS["walcl_delta_bullish"]
+_WALCL_BEAR = METRIC_THRESHOLDS["walcl_delta_bearish"]
+_RRP_BULL = METRIC_THRESHOLDS["rrp_delta_bullish"]
+_RRP_BEAR = METRIC_THRESHOLDS["rrp_delta_bearish"]
+_HY_BULL = METRIC_THRESHOLDS["hy_spread_bullish"]
+_HY_BEAR = METRIC_THRESHOLDS["hy_spread_bearish"]
+_DXY_BULL = METRIC_THRESHOLDS["dxy_bullish"]
+_DXY_BEAR = METRIC_THRESHOLDS["dxy_bearish"]
+_STABLE_BULL = METRIC_THRESHOLDS["stablecoin_bullish"]
+_STABLE_BEAR = METRIC_THRESHOLDS["stablecoin_bearish"]
+
+# Where each metric keeps its inputs (None = metric has no acceleration)
+_DELTA_FIELDS = ("delta_4w", "delta_4w", "delta_4w", "delta_4w", "delta_21d")
+_ACCEL_FIELDS = ("acceleration", "acceleration", None, None, None)
+
+# +1 = higher is bullish, -1 = inverted (RRP, HY spreads, DXY).
+# Inputs and thresholds are multiplied by this so every metric is scored
+# as "normalised delta >= bullish -> +1, <= bearish -> -1".
+_DIRECTION = np.array([1.0, -1.0, -1.0, -1.0, 1.0])
+_THRESHOLDS = np.array([
+    [_WALCL_BULL, _WALCL_BEAR],
+    [_RRP_BULL, _RRP_BEAR],
+    [_HY_BULL, _HY_BEAR],
+    [_DXY_BULL, _DXY_BEAR],
+    [_STABLE_BULL, _STABLE_BEAR],
+]) * _DIRECTION[:, None]
+
+# Reason templates keyed by (metric, signal tag); d = delta in percent,
+# level = optional current-level suffix from _LEVEL_FORMATTERS
+_TEMPLATES = {
+    ("walcl", "bull"): "Expanding +{d:.1f}%{level}",
+    ("walcl", "bull_acc"): "Expanding +{d:.1f}%{level} (accelerating)",
+    ("walcl", "bear"): "Contracting {d:.1f}%{level}",
+    ("walcl", "bear_acc"): "Contracting {d:.1f}%{level} (accelerating)",
+    ("walcl", "flat"): "Flat ({d:+.1f}%){level}",
+    ("rrp", "bull"): "Draining {d:.1f}%{level}",
+    ("rrp", "bull_acc"): "Draining {d:.1f}%{level} (accelerating)",
+    ("rrp", "bear"): "Building +{d:.1f}%{level}",
+    ("rrp", "bear_acc"): "Building +{d:.1f}%{level} (accelerating)",
+    ("rrp", "flat"): "Stable ({d:+.1f}%){level}",
+    ("hy_spread", "bull"): "Tightening {d:.1f}%{level}",
+    ("hy_spread", "bear"): "Widening +{d:.1f}%{level}",
+    ("hy_spread", "flat"): "Stable ({d:+.1f}%){level}",
+    ("dxy", "bull"): "Weakening {d:.1f}%{level}",
+    ("dxy", "bear"): "Strengthening +{d:.1f}%{level}",
+    ("dxy", "flat"): "Stable ({d:+.1f}%){level}",
+    ("stablecoin", "bull"): "Growing +{d:.1f}%{level}",
+    ("stablecoin", "bear"): "Shrinking {d:.1f}%{level}",
+    ("stablecoin", "flat"): "Flat ({d:+.1f}%){level}",
+}
+
+# (score, accelerating in the scored direction) -> template tag
+_SIGNAL_TAGS = {
+    (1, False): "bull",
+    (1, True): "bull_acc",
+    (-1, False): "bear",
+    (-1, True): "bear_acc",
+    (0, False): "flat",
+    (0, True): "flat",
+}
+
+# Optional current-level suffix per metric
+_LEVEL_FORMATTERS = (
+    None,
+    None,
+    lambda current: f" ({current*100:.0f}bps)",
+    lambda current: f" ({current:.1f})",
+    lambda current: f" (${current/1e9:.0f}B)",
+)
+
+
+def _score_loop(deltas: np.ndarray, accels: np.ndarray, thresholds: np.ndarray):
+    """
+    Score every metric in one pass over direction-normalised inputs.
 
-def score_walcl(metrics: Dict[str, Any]) -> Tuple[int, str]:
+    deltas/accels are float64[5] (NaN when missing), thresholds is
+    float64[5, 2] of (bullish, bearish). Returns int8 scores and int8
+    acceleration flags (+1 bullish direction, -1 bearish, 0 none).
     """
-    Score Fed Balance Sheet (WALCL).
-    Bullish: Expansion (positive delta, accelerating)
-    Bearish: Contraction
+    n = deltas.shape[0]
+    scores = np.zeros(n, dtype=np.int8)
+    accel_flags = np.zeros(n, dtype=np.int8)
+    for i in range(n):
+        d = deltas[i]
+        if d >= thresholds[i, 0]:
+            scores[i] = 1
+        elif d <= thresholds[i, 1]:
+            scores[i] = -1
+        a = accels[i]
+        if a > 0:
+            accel_flags[i] = 1
+        elif a < 0:
+            accel_flags[i] = -1
+    return scores, accel_flags
+
+
+def _score_vectorized(deltas: np.ndarray, accels: np.ndarray, thresholds: np.ndarray):
+    """Branchless NumPy equivalent of _score_loop (NaN compares False -> 0)."""
+    scores = (deltas >= thresholds[:, 0]).view(np.int8) - (deltas <= thresholds[:, 1]).view(np.int8)
+    accel_flags = (accels > 0).view(np.int8) - (accels < 0).view(np.int8)
+    return scores, accel_flags
+
+
+try:
+    # Ahead-of-time compiled kernel (scoring/_kernel.pyx), if built
+    from ._kernel import score_kernel as _score_kernel
+except ImportError:
+    if _NUMBA_AVAILABLE:
+        # No fastmath: missing inputs are NaN and must compare False
+        _score_kernel = njit(cache=True)(_score_loop)
+        # Compile at import so the first request doesn't pay for the JIT
+        _score_kernel(np.zeros(len(_METRIC_KEYS)), np.zeros(len(_METRIC_KEYS)), _THRESHOLDS)
+    else:
+        _score_kernel = _score_vectorized
+
+
+def _format_reason(i: int, score: int, delta: float, accel_flag: int, current) -> str:
+    """Build the human-readable reason for metric i from its template."""
+    level = _LEVEL_FORMATTERS[i]
+    template = _TEMPLATES[_METRIC_KEYS[i], _SIGNAL_TAGS[score, accel_flag == score]]
+    return template.format(
+        d=delta * 100,
+        level=level(current) if level and current else "",
+    )
+
+
+def _metric_inputs(metrics: Dict[str, Any]) -> Tuple[Tuple[Any, Any, Any], ...]:
+    """Extract (delta, acceleration, current) per metric as a hashable tuple."""
+    inputs = []
+    for i, key in enumerate(_METRIC_KEYS):
+        data = metrics.get(key, {})
+        accel_field = _ACCEL_FIELDS[i]
+        inputs.append((
+            data.get(_DELTA_FIELDS[i]),
+            data.get(accel_field) if accel_field else None,
+            data.get("current"),
+        ))
+    return tuple(inputs)
+
+
+def _score_inputs(inputs: Tuple[Tuple[Any, Any, Any], ...]) -> Tuple[np.ndarray, Tuple[str, ...]]:
+    """Score extracted inputs, returning int8 scores in _METRIC_KEYS order and reasons."""
+    n = len(_METRIC_KEYS)
+    deltas = np.full(n, np.nan)
+    accels = np.full(n, np.nan)
+
+    for i, (delta, accel, _) in enumerate(inputs):
+        if delta is not None:
+            deltas[i] = delta * _DIRECTION[i]
+        if accel is not None:
+            accels[i] = accel * _DIRECTION[i]
+
+    scores, accel_flags = _score_kernel(deltas, accels, _THRESHOLDS)
+
+    reasons = tuple(
+        "No data" if delta is None
+        else _format_reason(i, score, delta, accel_flag, current)
+        for i, (score, accel_flag, (delta, _, current)) in enumerate(
+            zip(scores.tolist(), accel_flags.tolist(), inputs)
+        )
+    )
+    return scores, reasons
+
+
+def _score_raw(metrics: Dict[str, Any]) -> Tuple[np.ndarray, Tuple[str, ...]]:
     """
-    walcl = metrics.get("walcl", {})
-    delta = walcl.get("delta_4w")
-    accel = walcl.get("acceleration")
+    Score all metrics without building any per-metric objects: int8 scores
+    in _METRIC_KEYS order and a tuple of reasons. The public dict shape is
+    only assembled by calculate_scores.
+    """
+    return _score_inputs(_metric_inputs(metrics))
+
 
+def _score_one(metrics: Dict[str, Any], key: str) -> Tuple[int, str]:
+    """
+    Score a single metric via the fused kernel. Only this metric's inputs
+    are filled in (the rest stay NaN and score 0) and only its reason is
+    formatted.
+    """
+    i = _METRIC_INDEX[key]
+    data = metrics.get(key, {})
+    delta = data.get(_DELTA_FIELDS[i])
     if delta is None:
         return 0, "No data"
+    accel_field = _ACCEL_FIELDS[i]
+    accel = data.get(accel_field) if accel_field else None
 
-    if delta >= METRIC_THRESHOLDS["walcl_delta_bullish"]:
-        if accel and accel > 0:
-            return 1, f"Expanding +{delta*100:.1f}% (accelerating)"
-        return 1, f"Expanding +{delta*100:.1f}%"
-    elif delta <= METRIC_THRESHOLDS["walcl_delta_bearish"]:
-        if accel and accel < 0:
-            return -1, f"Contracting {delta*100:.1f}% (accelerating)"
-        return -1, f"Contracting {delta*100:.1f}%"
-    else:
-        return 0, f"Flat ({delta*100:+.1f}%)"
+    n = len(_METRIC_KEYS)
+    deltas = np.full(n, np.nan)
+    accels = np.full(n, np.nan)
+    deltas[i] = delta * _DIRECTION[i]
+    if accel is not None:
+        accels[i] = accel * _DIRECTION[i]
+
+    scores, accel_flags = _score_kernel(deltas, accels, _THRESHOLDS)
+    score = int(scores[i])
+    return score, _format_reason(i, score, delta, int(accel_flags[i]), data.get("current"))
+
+
+def score_walcl(metrics: Dict[str, Any]) -> Tuple[int, str]:
+    """
+    Score Fed Balance Sheet (WALCL).
+    Bullish: Expansion (positive delta, accelerating)
+    Bearish: Contraction
+    """
+    return _score_one(metrics, "walcl")
 
 
 def score_rrp(metrics: Dict[str, Any]) -> Tuple[int, str]:
@@ -37,24 +236,7 @@ def score_rrp(metrics: Dict[str, Any]) -> Tuple[int, str]:
     Bullish: Drawdown (money leaving RRP = entering markets)
     Bearish: Buildup (money parking in RRP = leaving markets)
     """
-    rrp = metrics.get("rrp", {})
-    delta = rrp.get("delta_4w")
-    accel = rrp.get("acceleration")
-
-    if delta is None:
-        return 0, "No data"
-
-    # Note: RRP is inverted - decrease is bullish
-    if delta <= METRIC_THRESHOLDS["rrp_delta_bullish"]:
-        if accel and accel < 0:
-            return 1, f"Draining {delta*100:.1f}% (accelerating)"
-        return 1, f"Draining {delta*100:.1f}%"
-    elif delta >= METRIC_THRESHOLDS["rrp_delta_bearish"]:
-        if accel and accel > 0:
-            return -1, f"Building +{delta*100:.1f}% (accelerating)"
-        return -1, f"Building +{delta*100:.1f}%"
-    else:
-        return 0, f"Stable ({delta*100:+.1f}%)"
+    return _score_one(metrics, "rrp")
 
 
 def score_hy_spread(metrics: Dict[str, Any]) -> Tuple[int, str]:
@@ -63,21 +245,7 @@ def score_hy_spread(metrics: Dict[str, Any]) -> Tuple[int, str]:
     Bullish: Tightening (spreads narrowing = risk-on)
     Bearish: Widening (spreads widening = risk-off)
     """
-    hy = metrics.get("hy_spread", {})
-    delta = hy.get("delta_4w")
-    current = hy.get("current")
-
-    if delta is None:
-        return 0, "No data"
-
-    level_str = f" ({current*100:.0f}bps)" if current else ""
-
-    if delta <= METRIC_THRESHOLDS["hy_spread_bullish"]:
-        return 1, f"Tightening {delta*100:.1f}%{level_str}"
-    elif delta >= METRIC_THRESHOLDS["hy_spread_bearish"]:
-        return -1, f"Widening +{delta*100:.1f}%{level_str}"
-    else:
-        return 0, f"Stable ({delta*100:+.1f}%){level_str}"
+    return _score_one(metrics, "hy_spread")
 
 
 def score_dxy(metrics: Dict[str, Any]) -> Tuple[int, str]:
@@ -86,21 +254,7 @@ def score_dxy(metrics: Dict[str, Any]) -> Tuple[int, str]:
     Bullish: Weakening dollar
     Bearish: Strengthening dollar
     """
-    dxy = metrics.get("dxy", {})
-    delta = dxy.get("delta_4w")
-    current = dxy.get("current")
-
-    if delta is None:
-        return 0, "No data"
-
-    level_str = f" ({current:.1f})" if current else ""
-
-    if delta <= METRIC_THRESHOLDS["dxy_bullish"]:
-        return 1, f"Weakening {delta*100:.1f}%{level_str}"
-    elif delta >= METRIC_THRESHOLDS["dxy_bearish"]:
-        return -1, f"Strengthening +{delta*100:.1f}%{level_str}"
-    else:
-        return 0, f"Stable ({delta*100:+.1f}%){level_str}"
+    return _score_one(metrics, "dxy")
 
 
 def score_stablecoin(metrics: Dict[str, Any]) -> Tuple[int, str]:
@@ -109,84 +263,88 @@ def score_stablecoin(metrics: Dict[str, Any]) -> Tuple[int, str]:
     Bullish: Growing supply = capital inflows
     Bearish: Shrinking supply = capital outflows
     """
-    stable = metrics.get("stablecoin", {})
-    delta = stable.get("delta_21d")
-    current = stable.get("current")
+    return _score_one(metrics, "stablecoin")
 
-    if delta is None:
-        return 0, "No data"
-
-    level_str = f" (${current/1e9:.0f}B)" if current else ""
 
-    if delta >= METRIC_THRESHOLDS["stablecoin_bullish"]:
-        return 1, f"Growing +{delta*100:.1f}%{level_str}"
-    elif delta <= METRIC_THRESHOLDS["stablecoin_bearish"]:
-        return -1, f"Shrinking {delta*100:.1f}%{level_str}"
-    else:
-        return 0, f"Flat ({delta*100:+.1f}%){level_str}"
+# One-slot memo: (metrics object last scored, its result). Holds a reference
+# rather than id() so a recycled id can never alias a different dict.
+_last_scored: Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]] = (None, None)
 
 
 def calculate_scores(metrics: Dict[str, Any]) -> Dict[str, Any]:
     """
     Calculate all individual scores and weighted total.
     Returns dict with scores, reasons, and total.
-    """
-    scores = {}
 
-    # Calculate each metric score
-    score, reason = score_walcl(metrics)
-    scores["walcl"] = {
-        "score": score,
-        "weighted": score * WEIGHTS["walcl"],
-        "reason": reason,
-        "weight": WEIGHTS["walcl"],
-    }
-
-    score, reason = score_rrp(metrics)
-    scores["rrp"] = {
-        "score": score,
-        "weighted": score * WEIGHTS["rrp"],
-        "reason": reason,
-        "weight": WEIGHTS["rrp"],
-    }
-
-    score, reason = score_hy_spread(metrics)
-    scores["hy_spread"] = {
-        "score": score,
-        "weighted": score * WEIGHTS["hy_spread"],
-        "reason": reason,
-        "weight": WEIGHTS["hy_spread"],
-    }
-
-    score, reason = score_dxy(metrics)
-    scores["dxy"] = {
-        "score": score,
-        "weighted": score * WEIGHTS["dxy"],
-        "reason": reason,
-        "weight": WEIGHTS["dxy"],
-    }
+    Results are memoized on the scalar inputs, so repeat calls between
+    data refreshes return the same (shared, treat as read-only) dict.
+    """
+    global _last_scored
+    last_metrics, last_result = _last_scored
+    if metrics is last_metrics:
+        return last_result
 
-    score, reason = score_stablecoin(metrics)
-    scores["stablecoin"] = {
-        "score": score,
-        "weighted": score * WEIGHTS["stablecoin"],
-        "reason": reason,
-        "weight": WEIGHTS["stablecoin"],
-    }
+    btc = metrics.get("btc", {})
+    result = _calculate_scores_cached(
+        _metric_inputs(metrics),
+        btc.get("above_200dma", False),
+        btc.get("distance_from_200dma"),
+    )
+    # One tuple assignment so concurrent threads never see a mismatched pair
+    _last_scored = (metrics, result)
+    return result
+
+
+@lru_cache(maxsize=32)
+def _calculate_scores_cached(
+    inputs: Tuple[Tuple[Any, Any, Any], ...],
+    btc_above_200dma: bool,
+    btc_distance: Optional[float],
+) -> Dict[str, Any]:
+    """Build the calculate_scores result for one snapshot of scalar inputs."""
+    scores_arr, reasons = _score_inputs(inputs)
 
     # Calculate total weighted score
-    total = sum(s["weighted"] for s in scores.values())
-
-    # BTC gate check
-    btc = metrics.get("btc", {})
-    btc_above_200dma = btc.get("above_200dma", False)
-    btc_distance = btc.get("distance_from_200dma")
+    total = float(scores_arr @ _WEIGHTS_VEC)
+
+    scores = {
+        key: {
+            "score": score,
+            "weighted": score * weight,
+            "reason": reason,
+            "weight": weight,
+        }
+        for key, score, weight, reason in zip(
+            _METRIC_KEYS, scores_arr.tolist(), _WEIGHTS_VEC.tolist(), reasons
+        )
+    }
 
     return {
         "individual": scores,
         "total": total,
-        "max_possible": sum(WEIGHTS.values()),
-        "min_possible": -sum(WEIGHTS.values()),
+        "max_possible": _MAX_POSSIBLE,
+        "min_possible": _MIN_POSSIBLE,
         "btc_above_200dma": btc_above_200dma,
         "btc_distance_from_200dma": btc_distance,
     }
+
+
+def calculate_scores_batch(metrics_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Score a time series of metric snapshots in one vectorized pass.
+    Expects one row per date with "<metric>_delta" columns (e.g. walcl_delta,
+    stablecoin_delta); missing columns or NaN deltas score 0.
+    Returns int8 score columns per metric plus the weighted total.
+    """
+    deltas = metrics_df.reindex(
+        columns=[f"{key}_delta" for key in _METRIC_KEYS]
+    ).to_numpy(dtype=np.float64) * _DIRECTION
+
+    scores = (
+        (deltas >= _THRESHOLDS[:, 0]).view(np.int8)
+        - (deltas <= _THRESHOLDS[:, 1]).view(np.int8)
+    )
+
+    result = pd.DataFrame(scores, index=metrics_df.index, columns=list(_METRIC_KEYS))
+    result["total"] = scores @ _WEIGHTS_VEC
+    return result
@@ -4,6 +4,67 @@ Generate opinionated regime explanations
 
 from typing import Dict, Any
 
+# Templates parsed once at import; bound .format methods keep the
+# per-request work to a single call
+_TPL_WALCL_BULL = "Fed liquidity expanding at {:+.1f}% over 4 weeks{}.".format
+_TPL_WALCL_BEAR = "Fed balance sheet contracting {:.1f}% over 4 weeks.".format
+_TPL_STABLE_BULL = "Stablecoin supply growing {:+.1f}% over 21 days.".format
+_TPL_HY_LEVEL = " now at {:.0f}bps".format
+_TPL_HY_BEAR = "Credit spreads widening{}, signaling stress.".format
+_TPL_BTC_ABOVE = "BTC trading {:.1f}% above 200DMA.".format
+_TPL_BTC_BELOW = "BTC trading {:.1f}% below 200DMA.".format
+_TPL_SIGNAL = "{}: {}".format
+_TPL_DAYS = " (Day {} of regime)".format
+_TPL_FLIP = "Potential flip to {} in {} day(s) if trend continues.".format
+
+# Indexed by whether WALCL is accelerating
+_ACC_STR = ("", " and accelerating")
+
+
+def _walcl_expanding(metrics: Dict) -> str:
+    """Fed balance sheet expansion sentence."""
+    walcl_data = metrics.get("walcl", {})
+    delta = walcl_data.get("delta_4w", 0) or 0
+    accel = walcl_data.get("acceleration")
+    return _TPL_WALCL_BULL(delta * 100, _ACC_STR[bool(accel and accel > 0)])
+
+
+def _walcl_contracting(metrics: Dict) -> str:
+    """Fed balance sheet contraction sentence."""
+    delta = metrics.get("walcl", {}).get("delta_4w", 0) or 0
+    return _TPL_WALCL_BEAR(delta * 100)
+
+
+def _hy_widening(metrics: Dict) -> str:
+    """Credit spread widening sentence, with current level if known."""
+    current = metrics.get("hy_spread", {}).get("current")
+    level_str = _TPL_HY_LEVEL(current * 100) if current else ""
+    return _TPL_HY_BEAR(level_str)
+
+
+def _stable_growing(metrics: Dict) -> str:
+    """Stablecoin supply growth sentence."""
+    delta = metrics.get("stablecoin", {}).get("delta_21d", 0) or 0
+    return _TPL_STABLE_BULL(delta * 100)
+
+
+# (metric, body text builder) in render order; a sentence is included when
+# the metric's score agrees with the regime
+_AGGRESSIVE_SIGNALS = (
+    ("walcl", _walcl_expanding),
+    ("rrp", lambda metrics: "Reverse repo drawdown continues — capital returning to risk markets."),
+    ("hy_spread", lambda metrics: "Credit spreads tightening, signaling risk appetite."),
+    ("stablecoin", _stable_growing),
+)
+
+_DEFENSIVE_SIGNALS = (
+    ("walcl", _walcl_contracting),
+    ("rrp", lambda metrics: "Reverse repo building — capital fleeing risk markets for safety."),
+    ("hy_spread", _hy_widening),
+    ("dxy", lambda metrics: "Dollar strengthening, adding pressure to risk assets."),
+    ("stablecoin", lambda metrics: "Stablecoin supply contracting — capital exiting crypto ecosystem."),
+)
+
 
 def generate_explanation(
     regime: str,
@@ -41,38 +102,15 @@ def _explain_aggressive(
     """Generate aggressive regime explanation."""
 
     # Build body from strongest signals
-    body_parts = []
-
-    walcl = individual.get("walcl", {})
-    if walcl.get("score", 0) > 0:
-        walcl_data = metrics.get("walcl", {})
-        delta = walcl_data.get("delta_4w", 0) or 0
-        accel = walcl_data.get("acceleration")
-        accel_str = " and accelerating" if accel and accel > 0 else ""
-        body_parts.append(
-            f"Fed liquidity expanding at {delta*100:+.1f}% over 4 weeks{accel_str}."
-        )
-
-    rrp = individual.get("rrp", {})
-    if rrp.get("score", 0) > 0:
-        body_parts.append(
-            "Reverse repo drawdown continues — capital returning to risk markets."
-        )
-
-    hy = individual.get("hy_spread", {})
-    if hy.get("score", 0) > 0:
-        body_parts.append("Credit spreads tightening, signaling risk appetite.")
-
-    stable = individual.get("stablecoin", {})
-    if stable.get("score", 0) > 0:
-        stable_data = metrics.get("stablecoin", {})
-        delta = stable_data.get("delta_21d", 0) or 0
-        body_parts.append(f"Stablecoin supply growing {delta*100:+.1f}% over 21 days.")
+    body_parts = [
+        text(metrics) for name, text in _AGGRESSIVE_SIGNALS
+        if individual.get(name, {}).get("score", 0) > 0
+    ]
 
     btc = metrics.get("btc", {})
     distance = btc.get("distance_from_200dma")
     if distance:
-        body_parts.append(f"BTC trading {distance*100:.1f}% above 200DMA.")
+        body_parts.append(_TPL_BTC_ABOVE(distance * 100))
 
     body = " ".join(body_parts) if body_parts else "Multiple liquidity indicators aligned bullish."
 
@@ -80,12 +118,12 @@ def _explain_aggressive(
     warnings = []
     for name, data in individual.items():
         if data.get("score", 0) < 0:
-            warnings.append(f"{name.upper()}: {data.get('reason', 'bearish')}")
+            warnings.append(_TPL_SIGNAL(name.upper(), data.get("reason", "bearish")))
 
     warning_str = " However, watch: " + "; ".join(warnings) if warnings else ""
 
     days = regime_info.get("days_in_regime")
-    days_str = f" (Day {days} of regime)" if days else ""
+    days_str = _TPL_DAYS(days) if days else ""
 
     return {
         "headline": f"AGGRESSIVE{days_str}",
@@ -103,43 +141,21 @@ def _explain_defensive(
 ) -> Dict[str, str]:
     """Generate defensive regime explanation."""
 
-    body_parts = []
-
-    walcl = individual.get("walcl", {})
-    if walcl.get("score", 0) < 0:
-        walcl_data = metrics.get("walcl", {})
-        delta = walcl_data.get("delta_4w", 0) or 0
-        body_parts.append(f"Fed balance sheet contracting {delta*100:.1f}% over 4 weeks.")
-
-    rrp = individual.get("rrp", {})
-    if rrp.get("score", 0) < 0:
-        body_parts.append("Reverse repo building — capital fleeing risk markets for safety.")
-
-    hy = individual.get("hy_spread", {})
-    if hy.get("score", 0) < 0:
-        hy_data = metrics.get("hy_spread", {})
-        current = hy_data.get("current")
-        level_str = f" now at {current*100:.0f}bps" if current else ""
-        body_parts.append(f"Credit spreads widening{level_str}, signaling stress.")
-
-    dxy = individual.get("dxy", {})
-    if dxy.get("score", 0) < 0:
-        body_parts.append("Dollar strengthening, adding pressure to risk assets.")
-
-    stable = individual.get("stablecoin", {})
-    if stable.get("score", 0) < 0:
-        body_parts.append("Stablecoin supply contracting — capital exiting crypto ecosystem.")
+    body_parts = [
+        text(metrics) for name, text in _DEFENSIVE_SIGNALS
+        if individual.get(name, {}).get("score", 0) < 0
+    ]
 
     btc = metrics.get("btc", {})
     if not btc.get("above_200dma"):
         distance = btc.get("distance_from_200dma")
         if distance:
-            body_parts.append(f"BTC trading {abs(distance)*100:.1f}% below 200DMA.")
+            body_parts.append(_TPL_BTC_BELOW(abs(distance) * 100))
 
     body = " ".join(body_parts) if body_parts else "Multiple liquidity indicators aligned bearish."
 
     days = regime_info.get("days_in_regime")
-    days_str = f" (Day {days} of regime)" if days else ""
+    days_str = _TPL_DAYS(days) if days else ""
 
     return {
         "headline": f"DEFENSIVE{days_str}",
@@ -157,27 +173,23 @@ def _explain_balanced(
 ) -> Dict[str, str]:
     """Generate balanced regime explanation."""
 
-    # Count bullish vs bearish signals
+    # Partition active signals in one pass (neutral ones aren't rendered)
     bullish = []
     bearish = []
-    neutral = []
 
     for name, data in individual.items():
         score = data.get("score", 0)
-        reason = data.get("reason", "")
         if score > 0:
-            bullish.append(f"{name.upper()}: {reason}")
+            bullish.append(_TPL_SIGNAL(name.upper(), data.get("reason", "")))
         elif score < 0:
-            bearish.append(f"{name.upper()}: {reason}")
-        else:
-            neutral.append(f"{name.upper()}: {reason}")
+            bearish.append(_TPL_SIGNAL(name.upper(), data.get("reason", "")))
 
     body_parts = []
 
     if bullish:
-        body_parts.append(f"Bullish: {'; '.join(bullish)}.")
+        body_parts.append("Bullish: " + "; ".join(bullish) + ".")
     if bearish:
-        body_parts.append(f"Bearish: {'; '.join(bearish)}.")
+        body_parts.append("Bearish: " + "; ".join(bearish) + ".")
 
     if not body_parts:
         body_parts.append("Mixed signals across liquidity indicators.")
@@ -194,12 +206,12 @@ def _explain_balanced(
         proposed = regime_info.get("proposed_regime", "").upper()
         days_until = regime_info.get("days_until_flip", 0)
         if days_until and days_until > 0:
-            body_parts.append(f"Potential flip to {proposed} in {days_until} day(s) if trend continues.")
+            body_parts.append(_TPL_FLIP(proposed, days_until))
 
     body = " ".join(body_parts)
 
     days = regime_info.get("days_in_regime")
-    days_str = f" (Day {days} of regime)" if days else ""
+    days_str = _TPL_DAYS(days) if days else ""
 
     return {
         "headline": f"BALANCED{days_str}",
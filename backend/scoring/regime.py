@@ -185,6 +185,7 @@ def determine_regime(
         "btc_gate_passed": btc_gate,
         "consecutive_days": state.consecutive_days,
         "days_in_regime": days_in_regime,
+        "regime_start_date": state.regime_start_date,
         "score_trend": trend,
         "pending_flip": proposed != state.current_regime,
         "days_until_flip": max(0, HYSTERESIS["consecutive_days_required"] - state.consecutive_days) if proposed != state.current_regime else None,
@@ -18,19 +18,114 @@ except ImportError:
     import psycopg2
 
 STATEMENTS = [
+    # Case-insensitive text type for emails
+    "CREATE EXTENSION IF NOT EXISTS citext",
     # Create table
     """
     CREATE TABLE IF NOT EXISTS subscribers (
         id SERIAL PRIMARY KEY,
-        email TEXT UNIQUE NOT NULL,
+        email CITEXT UNIQUE NOT NULL,
         cadence TEXT NOT NULL DEFAULT 'daily',
         is_waitlist BOOLEAN NOT NULL DEFAULT FALSE,
         confirmed BOOLEAN NOT NULL DEFAULT FALSE,
         subscribed_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
     )
     """,
-    # Create index
-    "CREATE INDEX IF NOT EXISTS idx_subscribers_email ON subscribers(email)",
+    # Migrate tables created before emails were CITEXT; the UNIQUE index is
+    # rebuilt as case-insensitive, so lookups by any casing stay index probes
+    "ALTER TABLE subscribers ALTER COLUMN email TYPE CITEXT",
+    # Redundant with the UNIQUE constraint's index
+    "DROP INDEX IF EXISTS idx_subscribers_email",
+    # Insert-or-fetch in one statement. The no-op DO UPDATE makes RETURNING
+    # yield the existing row on conflict; xmax = 0 only for a fresh insert.
+    # These functions are reachable over PostgREST, so they run with the
+    # caller's privileges (SECURITY INVOKER) rather than the owner's.
+    """
+    CREATE OR REPLACE FUNCTION insert_or_get(p_email TEXT, p_cadence TEXT, p_is_waitlist BOOLEAN)
+    RETURNS TABLE (
+        inserted BOOLEAN,
+        id INT,
+        email CITEXT,
+        cadence TEXT,
+        is_waitlist BOOLEAN,
+        confirmed BOOLEAN,
+        subscribed_at TIMESTAMPTZ
+    )
+    LANGUAGE sql
+    SECURITY INVOKER
+    SET search_path = public
+    AS $$
+        INSERT INTO subscribers AS s (email, cadence, is_waitlist)
+        VALUES (lower(p_email), p_cadence, p_is_waitlist)
+        ON CONFLICT (email) DO UPDATE SET email = s.email
+        RETURNING (s.xmax = 0), s.id, s.email, s.cadence, s.is_waitlist, s.confirmed, s.subscribed_at
+    $$
+    """,
+    # Promote with the database clock as the source of truth for subscribed_at.
+    # Runs with the caller's privileges: it must not let API clients that can
+    # reach it over PostgREST do anything they couldn't do to the table directly.
+    """
+    CREATE OR REPLACE FUNCTION promote_from_waitlist(p_email TEXT)
+    RETURNS BOOLEAN
+    LANGUAGE sql
+    SECURITY INVOKER
+    SET search_path = public
+    AS $$
+        WITH promoted AS (
+            UPDATE subscribers
+            SET is_waitlist = FALSE, subscribed_at = NOW()
+            WHERE email = p_email::CITEXT
+            RETURNING 1
+        )
+        SELECT EXISTS (SELECT 1 FROM promoted)
+    $$
+    """,
+    # Subscribe in one round trip: capacity count and insert-or-fetch run
+    # in a single transaction (called via client.rpc)
+    """
+    CREATE OR REPLACE FUNCTION atomic_subscribe(p_email TEXT, p_cadence TEXT, p_max INT)
+    RETURNS JSONB
+    LANGUAGE plpgsql
+    SECURITY INVOKER
+    SET search_path = public
+    AS $$
+    DECLARE
+        v_row RECORD;
+        v_count INT;
+        v_waitlist BOOLEAN;
+    BEGIN
+        -- Serialize signups so concurrent calls can't both take the last spot
+        PERFORM pg_advisory_xact_lock(hashtext('atomic_subscribe'));
+
+        SELECT COUNT(*) INTO v_count FROM subscribers WHERE NOT is_waitlist;
+        v_waitlist := v_count >= p_max;
+
+        SELECT * INTO v_row FROM insert_or_get(p_email, p_cadence, v_waitlist);
+        IF NOT v_row.inserted THEN
+            RETURN jsonb_build_object(
+                'already_existed', TRUE,
+                'waitlisted', v_row.is_waitlist
+            );
+        END IF;
+
+        IF v_waitlist THEN
+            RETURN jsonb_build_object(
+                'already_existed', FALSE,
+                'waitlisted', TRUE,
+                'spots_remaining', 0,
+                'waitlist_position', (SELECT COUNT(*) FROM subscribers WHERE is_waitlist)
+            );
+        END IF;
+
+        RETURN jsonb_build_object(
+            'already_existed', FALSE,
+            'waitlisted', FALSE,
+            'spot_number', v_count + 1,
+            'spots_remaining', GREATEST(0, p_max - v_count - 1)
+        );
+    END;
+    $$
+    """,
 ]
 
 SEED_DATA = """
@@ -57,19 +152,22 @@ def main():
         password=args.password,
         dbname=args.dbname
     )
-    conn.autocommit = True
+    conn.autocommit = False
     cursor = conn.cursor()
 
-    print("Creating subscribers table...")
-    for i, statement in enumerate(STATEMENTS):
-        try:
-            cursor.execute(statement)
-            print(f"  Step {i+1}/{len(STATEMENTS)} done")
-        except Exception as e:
-            print(f"  Step {i+1} error: {e}")
-
-    print("Seeding existing subscriber...")
-    cursor.execute(SEED_DATA)
+    print("Creating subscribers table and seeding existing subscriber...")
+    try:
+        # All DDL plus the seed in one round trip and one transaction,
+        # so a failure part-way leaves the database untouched
+        cursor.execute(";\n".join(STATEMENTS + [SEED_DATA]))
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        print(f"  Setup failed, rolled back: {e}")
+        cursor.close()
+        conn.close()
+        sys.exit(1)
+    print(f"  {len(STATEMENTS)} statements applied")
 
     # Verify
     cursor.execute("SELECT COUNT(*) FROM subscribers")
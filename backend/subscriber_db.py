@@ -4,8 +4,8 @@ Replaces ephemeral JSON file storage with persistent database.
 """
 
 import os
-from datetime import datetime
-from typing import Optional, Tuple
+import time
+from typing import Dict, Optional, Tuple
 from supabase import create_client, Client
 
 SUPABASE_URL = os.environ.get("SUPABASE_URL", "")
@@ -13,6 +13,10 @@ SUPABASE_KEY = os.environ.get("SUPABASE_KEY", "")
 
 _client: Optional[Client] = None
 
+# Short-lived count cache: is_waitlist -> (monotonic expiry, count)
+COUNT_CACHE_TTL = 5
+_count_cache: Dict[bool, Tuple[float, int]] = {}
+
 
 class SupabaseError(Exception):
     """Raised when Supabase operations fail."""
@@ -58,28 +62,56 @@ def get_all_waitlist() -> list[dict]:
         raise SupabaseError(f"Failed to get waitlist: {e}")
 
 
+def _cached_count(is_waitlist: bool) -> Optional[int]:
+    """Return a fresh cached count, or None."""
+    hit = _count_cache.get(is_waitlist)
+    if hit and time.monotonic() < hit[0]:
+        return hit[1]
+    return None
+
+
+def _store_count(is_waitlist: bool, count: int) -> int:
+    """Cache a count for COUNT_CACHE_TTL seconds and return it."""
+    _count_cache[is_waitlist] = (time.monotonic() + COUNT_CACHE_TTL, count)
+    return count
+
+
+def _invalidate_counts():
+    """Drop cached counts after any write that can change them."""
+    _count_cache.clear()
+
+
 def get_subscriber_count() -> int:
     """Get count of active subscribers."""
+    cached = _cached_count(False)
+    if cached is not None:
+        return cached
+
     client = get_client()
     if not client:
         return 0
 
     try:
-        result = client.table("subscribers").select("id", count="exact").eq("is_waitlist", False).execute()
-        return result.count or 0
+        # head=True: only the count header comes back, no row payload
+        result = client.table("subscribers").select("id", count="exact", head=True).eq("is_waitlist", False).execute()
+        return _store_count(False, result.count or 0)
     except Exception as e:
         raise SupabaseError(f"Failed to get subscriber count: {e}")
 
 
 def get_waitlist_count() -> int:
     """Get count of waitlisted subscribers."""
+    cached = _cached_count(True)
+    if cached is not None:
+        return cached
+
     client = get_client()
     if not client:
         return 0
 
     try:
-        result = client.table("subscribers").select("id", count="exact").eq("is_waitlist", True).execute()
-        return result.count or 0
+        result = client.table("subscribers").select("id", count="exact", head=True).eq("is_waitlist", True).execute()
+        return _store_count(True, result.count or 0)
     except Exception as e:
         raise SupabaseError(f"Failed to get waitlist count: {e}")
 
@@ -105,29 +137,30 @@ def add_subscriber(email: str, cadence: str, is_waitlist: bool = False) -> dict:
     if not client:
         raise SupabaseError("Supabase not configured")
 
-    data = {
-        "email": email.lower(),
-        "cadence": cadence,
-        "is_waitlist": is_waitlist,
-        "confirmed": False,
-        "subscribed_at": datetime.now().isoformat(),
-    }
-
     try:
-        result = client.table("subscribers").insert(data).execute()
-        if result.data:
-            return result.data[0]
-        raise SupabaseError("Insert returned no data")
+        # One hop: insert_or_get reports whether the row was new
+        result = client.rpc("insert_or_get", {
+            "p_email": email.lower(),
+            "p_cadence": cadence,
+            "p_is_waitlist": is_waitlist,
+        }).execute()
     except Exception as e:
-        error_str = str(e).lower()
-        if "duplicate" in error_str or "unique" in error_str or "23505" in error_str:
-            raise SupabaseError("Email already exists")
         raise SupabaseError(f"Failed to add subscriber: {e}")
 
+    if not result.data:
+        raise SupabaseError("Insert returned no data")
+    row = result.data[0]
+    if not row.pop("inserted"):
+        raise SupabaseError("Email already exists")
+    _invalidate_counts()
+    return row
+
 
 def atomic_subscribe(email: str, cadence: str, max_subscribers: int) -> Tuple[bool, str, dict]:
     """
-    Atomically subscribe a user, handling race conditions.
+    Atomically subscribe a user via the atomic_subscribe Postgres function
+    (see setup_supabase.py), which checks, counts and inserts in a single
+    transaction and round trip.
 
     Returns: (success, message, data)
     - success: True if subscribed/waitlisted successfully
@@ -138,57 +171,48 @@ def atomic_subscribe(email: str, cadence: str, max_subscribers: int) -> Tuple[bo
     if not client:
         raise SupabaseError("Supabase not configured")
 
-    email = email.lower()
-
     try:
-        # Check if already exists
-        existing = find_subscriber(email)
-        if existing:
-            if existing.get("is_waitlist"):
-                return True, "You're on the waitlist! We'll notify you when a spot opens.", {
-                    "waitlisted": True, "already_existed": True
-                }
-            return True, "You're already subscribed!", {
-                "waitlisted": False, "already_existed": True
-            }
-
-        # Get current count
-        count = get_subscriber_count()
-        spots_remaining = max(0, max_subscribers - count)
-        is_waitlist = spots_remaining == 0
-
-        # Try to insert - if race condition, unique constraint will catch it
-        try:
-            add_subscriber(email, cadence, is_waitlist=is_waitlist)
-        except SupabaseError as e:
-            if "already exists" in str(e).lower():
-                # Race condition: someone else added this email
-                existing = find_subscriber(email)
-                if existing and existing.get("is_waitlist"):
-                    return True, "You're on the waitlist!", {"waitlisted": True, "already_existed": True}
-                return True, "You're already subscribed!", {"waitlisted": False, "already_existed": True}
-            raise
-
-        if is_waitlist:
-            waitlist_pos = get_waitlist_count()
-            return True, f"All spots taken! You're #{waitlist_pos} on the waitlist.", {
-                "waitlisted": True,
-                "spots_remaining": 0,
-                "waitlist_position": waitlist_pos,
-            }
-        else:
-            # Re-count to get accurate spot number (handles race condition)
-            new_count = get_subscriber_count()
-            return True, f"You're in! Spot #{new_count} of {max_subscribers}.", {
-                "waitlisted": False,
-                "spots_remaining": max(0, max_subscribers - new_count),
-                "spot_number": new_count,
-            }
-
-    except SupabaseError:
-        raise
+        result = client.rpc("atomic_subscribe", {
+            "p_email": email.lower(),
+            "p_cadence": cadence,
+            "p_max": max_subscribers,
+        }).execute()
     except Exception as e:
         raise SupabaseError(f"Subscribe failed: {e}")
+    finally:
+        _invalidate_counts()
+
+    return subscribe_result(result.data, max_subscribers)
+
+
+def subscribe_result(data: Optional[dict], max_subscribers: int) -> Tuple[bool, str, dict]:
+    """Map the atomic_subscribe function's JSON result to (success, message, data)."""
+    if not data:
+        raise SupabaseError("Subscribe returned no data")
+
+    if data.get("already_existed"):
+        if data.get("waitlisted"):
+            return True, "You're on the waitlist! We'll notify you when a spot opens.", {
+                "waitlisted": True, "already_existed": True
+            }
+        return True, "You're already subscribed!", {
+            "waitlisted": False, "already_existed": True
+        }
+
+    if data.get("waitlisted"):
+        waitlist_pos = data["waitlist_position"]
+        return True, f"All spots taken! You're #{waitlist_pos} on the waitlist.", {
+            "waitlisted": True,
+            "spots_remaining": 0,
+            "waitlist_position": waitlist_pos,
+        }
+
+    spot_number = data["spot_number"]
+    return True, f"You're in! Spot #{spot_number} of {max_subscribers}.", {
+        "waitlisted": False,
+        "spots_remaining": data["spots_remaining"],
+        "spot_number": spot_number,
+    }
 
 
 def update_subscriber(email: str, updates: dict) -> bool:
@@ -199,6 +223,7 @@ def update_subscriber(email: str, updates: dict) -> bool:
 
     try:
         result = client.table("subscribers").update(updates).eq("email", email.lower()).execute()
+        _invalidate_counts()
         return bool(result.data)
     except Exception as e:
         raise SupabaseError(f"Failed to update subscriber: {e}")
@@ -212,11 +237,21 @@ def delete_subscriber(email: str) -> bool:
 
     try:
         result = client.table("subscribers").delete().eq("email", email.lower()).execute()
+        _invalidate_counts()
         return bool(result.data)
     except Exception as e:
         raise SupabaseError(f"Failed to delete subscriber: {e}")
 
 
 def promote_from_waitlist(email: str) -> bool:
-    """Promote a waitlisted user to active subscriber."""
-    return update_subscriber(email, {"is_waitlist": False, "subscribed_at": datetime.now().isoformat()})
+    """Promote a waitlisted user to active subscriber (subscribed_at = DB NOW())."""
+    client = get_client()
+    if not client:
+        return False
+
+    try:
+        result = client.rpc("promote_from_waitlist", {"p_email": email.lower()}).execute()
+        _invalidate_counts()
+        return bool(result.data)
+    except Exception as e:
+        raise SupabaseError(f"Failed to promote subscriber: {e}")
@@ -2,82 +2,282 @@
 Subscriber management for email alerts.
 """
 
+import atexit
+import copy
+import hashlib
 import json
+import queue
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from typing import Optional
 import os
 
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 SUBSCRIBERS_FILE = Path(__file__).parent / "subscribers.json"
 
+RESEND_EMAILS_URL = "https://api.resend.com/emails"
+RESEND_BATCH_URL = "https://api.resend.com/emails/batch"
+RESEND_BATCH_SIZE = 100  # Resend's per-request limit for batch sends
+
+# Concurrent briefing sends (kept within the session's connection pool) and
+# how many times a transient failure (429/5xx) is retried with jittered
+# exponential backoff, capped at SEND_BACKOFF_CAP seconds
+SEND_WORKERS = 8
+SEND_RETRIES = 3
+SEND_BACKOFF_BASE = 0.5
+SEND_BACKOFF_CAP = 8.0
+# Consecutive failed batches after which the rest of a run is abandoned
+SEND_BREAKER_THRESHOLD = 10
+
+# local@domain.tld with no whitespace or extra @, checked in one pass
+_EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+# Shortest plausible address is a@b.c; 254 is the SMTP path limit
+_EMAIL_MIN_LEN, _EMAIL_MAX_LEN = 5, 254
+
+# Shared keep-alive session so bursts of sends reuse TLS connections. Only
+# connection failures are retried here: a POST that reached Resend may have
+# sent the email, and 429s are handled by _post_with_backoff.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, connect=3, read=0, status=0, backoff_factor=0.3),
+))
+
+# In-memory copy of the subscribers file, loaded on first use. Mutations
+# mark it dirty and a background writer coalesces them into one dump.
+_cache: Optional[dict] = None
+_cache_mtime: Optional[int] = None
+_email_index: set = set()
+_lock = threading.Lock()
+_dirty = threading.Event()
+# Mutation counter and the value it had in the last snapshot written to disk.
+# Unlike the _dirty wake-up flag (cleared before the writer dumps), these only
+# match once every change is actually on disk; both are guarded by _lock.
+_generation = 0
+_flushed_generation = 0
+_write_lock = threading.Lock()
+_writer: Optional[threading.Thread] = None
+
+
+def _file_mtime() -> Optional[int]:
+    """Modification time of the subscribers file in ns, or None if missing."""
+    try:
+        return SUBSCRIBERS_FILE.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
 
 def load_subscribers() -> dict:
-    """Load subscribers from JSON file."""
-    if SUBSCRIBERS_FILE.exists():
-        with open(SUBSCRIBERS_FILE, "r") as f:
-            return json.load(f)
-    return {"subscribers": []}
+    """
+    Load subscribers, re-reading the JSON file only when its mtime shows it
+    was changed by another writer (e.g. the API's own JSON fallback).
+    """
+    global _cache, _cache_mtime, _email_index
+    mtime = _file_mtime()
+    with _lock:
+        if _cache is not None and mtime == _cache_mtime:
+            return _cache
+
+    # Hold the write lock so a reload can't race our own in-flight snapshot
+    with _write_lock, _lock:
+        # Unflushed local changes win over the file until they are written
+        if _cache is None or (mtime != _cache_mtime and _generation == _flushed_generation):
+            if mtime is not None:
+                _cache = _loads(SUBSCRIBERS_FILE.read_bytes())
+            else:
+                _cache = {"subscribers": []}
+            _cache_mtime = mtime
+            _email_index = {s["email"] for s in _cache["subscribers"]}
+        return _cache
 
 
 def save_subscribers(data: dict):
-    """Save subscribers to JSON file."""
-    with open(SUBSCRIBERS_FILE, "w") as f:
-        json.dump(data, f, indent=2)
+    """Replace the in-memory subscribers and schedule a write to disk."""
+    global _cache, _email_index, _generation
+    with _lock:
+        _cache = data
+        _email_index = {s["email"] for s in data.get("subscribers", [])}
+        _generation += 1
+    _schedule_flush()
 
 
-def add_subscriber(email: str, cadence: str = "daily") -> tuple[bool, str]:
+def snapshot_subscribers() -> dict:
     """
-    Add a new subscriber.
-    Returns (success, message).
+    Private deep copy of the subscribers (including the waitlist), for
+    read-modify-save_subscribers callers such as main.py's JSON fallback.
     """
-    email = email.strip().lower()
+    data = load_subscribers()
+    with _lock:
+        return copy.deepcopy(_cache if _cache is not None else data)
 
-    # Basic validation
-    if not email or "@" not in email or "." not in email:
-        return False, "Please enter a valid email address."
 
+def _loads(raw: bytes) -> dict:
+    """Parse the subscribers file contents."""
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
+
+def _dumps(data: dict) -> bytes:
+    """Compact JSON for the hot write path (see export_subscribers)."""
+    if orjson:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+def _write_snapshot():
+    """
+    Write the current in-memory subscribers to the JSON file atomically:
+    write + fsync a temp file, then rename it over the original, so readers
+    never see a truncated file. The writer batches, so this is one fsync
+    per flush rather than per add.
+    """
+    global _cache_mtime, _flushed_generation
+    with _write_lock:
+        with _lock:
+            payload = _dumps(_cache)
+            generation = _generation
+        tmp = SUBSCRIBERS_FILE.with_suffix(".json.tmp")
+        with open(tmp, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, SUBSCRIBERS_FILE)
+        # Our own write shouldn't look like an external change
+        with _lock:
+            _cache_mtime = _file_mtime()
+            _flushed_generation = generation
+
+
+def export_subscribers(path: Path):
+    """Write a human-readable (indented) copy of the subscribers."""
     data = load_subscribers()
+    with _lock:
+        text = json.dumps(data, indent=2)
+    path.write_text(text)
 
-    # Check for duplicates
-    existing_emails = [s["email"] for s in data["subscribers"]]
-    if email in existing_emails:
-        return False, "You're already subscribed!"
 
-    # Add subscriber
-    data["subscribers"].append({
-        "email": email,
-        "cadence": cadence,
-        "subscribed_at": datetime.now().isoformat(),
-        "confirmed": False,
-    })
+def _writer_loop():
+    """Background writer: one file write per batch of dirty notifications."""
+    while True:
+        _dirty.wait()
+        # Clear before dumping: mutations made during the write re-set the
+        # flag and are picked up by the next pass
+        _dirty.clear()
+        _write_snapshot()
 
-    save_subscribers(data)
-    return True, "You're subscribed! You'll receive updates based on your preference."
 
+def _schedule_flush():
+    """Mark subscribers dirty, starting the background writer on first use."""
+    global _writer
+    with _lock:
+        if _writer is None:
+            _writer = threading.Thread(target=_writer_loop, name="subscribers-writer", daemon=True)
+            _writer.start()
+    _dirty.set()
 
-def send_confirmation_email(email: str, cadence: str) -> bool:
-    """Send a confirmation email via Resend."""
-    resend_api_key = os.environ.get("RESEND_API_KEY")
 
-    if not resend_api_key:
-        print("Warning: RESEND_API_KEY not set, skipping confirmation email")
-        return False
+@atexit.register
+def flush_subscribers():
+    """Synchronously write any pending changes (also runs at interpreter exit)."""
+    with _lock:
+        pending = _generation != _flushed_generation
+    if pending:
+        _dirty.clear()
+        _write_snapshot()
 
-    try:
-        import resend
-        resend.api_key = resend_api_key
-
-        cadence_text = {
-            "daily": "daily",
-            "weekly": "weekly (every Monday)",
-            "on_change": "when the regime changes",
-        }.get(cadence, cadence)
-
-        resend.Emails.send({
-            "from": "FlowState <alerts@flowstate.markets>",
-            "to": email,
-            "subject": "Welcome to FlowState — You're in",
-            "html": f"""
+
+# (unix time, local ISO string) of the last formatted timestamp
+_ts_cache = [0.0, ""]
+
+
+def _now_iso() -> str:
+    """Local-time ISO timestamp, re-formatted at most once per second."""
+    now = time.time()
+    if now - _ts_cache[0] >= 1.0:
+        _ts_cache[:] = [now, datetime.fromtimestamp(now).isoformat()]
+    return _ts_cache[1]
+
+
+def add_subscriber(email: str, cadence: str = "daily") -> tuple[bool, str]:
+    """
+    Add a new subscriber.
+    Returns (success, message).
+    """
+    return add_subscribers([(email, cadence)])[0]
+
+
+def add_subscribers(pairs: list[tuple[str, str]]) -> list[tuple[bool, str]]:
+    """
+    Add many (email, cadence) subscribers at once, e.g. for bulk imports.
+    Loads and flushes the store once for the whole batch.
+    Returns one (success, message) per pair, in order.
+    """
+    global _generation
+    # Make sure the cache is loaded (or reloaded after an external change),
+    # then append to whatever _cache is once the lock is held: a concurrent
+    # reload may have replaced the dict load_subscribers returned
+    load_subscribers()
+    results = []
+    added = False
+    subscribed_at = _now_iso()
+
+    with _lock:
+        data = _cache
+        for email, cadence in pairs:
+            email = email.strip().lower()
+
+            # Basic validation, cheap length bounds before the regex scan
+            if not _EMAIL_MIN_LEN <= len(email) <= _EMAIL_MAX_LEN or not _EMAIL_RE.match(email):
+                results.append((False, "Please enter a valid email address."))
+                continue
+
+            # Check for duplicates (O(1) via the email index, which also
+            # catches repeats within the batch)
+            if email in _email_index:
+                results.append((False, "You're already subscribed!"))
+                continue
+
+            # Add subscriber
+            data["subscribers"].append({
+                "email": email,
+                "cadence": cadence,
+                "subscribed_at": subscribed_at,
+                "confirmed": False,
+            })
+            _email_index.add(email)
+            added = True
+            results.append((True, "You're subscribed! You'll receive updates based on your preference."))
+        if added:
+            _generation += 1
+
+    if added:
+        _schedule_flush()
+    return results
+
+
+# How each cadence is described in the confirmation email
+CADENCE_TEXT = {
+    "daily": "daily",
+    "weekly": "weekly (every Monday)",
+    "on_change": "when the regime changes",
+}
+
+# Confirmation email body; only the cadence text varies per send, so the
+# template is split once around its placeholder
+_CONFIRMATION_HTML = """
             <!DOCTYPE html>
             <html>
             <head>
@@ -180,13 +380,85 @@ def send_confirmation_email(email: str, cadence: str) -> bool:
             </body>
             </html>
             """
-        })
+_CONFIRMATION_PREFIX, _CONFIRMATION_SUFFIX = _CONFIRMATION_HTML.split("{cadence_text}")
+
+# The confirmation request body, JSON-escaped and UTF-8 encoded once around
+# the per-send values (recipient and cadence text)
+_CONFIRMATION_HEAD_B = json.dumps({
+    "from": "FlowState <alerts@flowstate.markets>",
+    "subject": "Welcome to FlowState — You're in",
+})[:-1].encode("utf-8") + b', "to": '
+_CONFIRMATION_PREFIX_B = b', "html": ' + json.dumps(_CONFIRMATION_PREFIX)[:-1].encode("utf-8")
+_CONFIRMATION_SUFFIX_B = json.dumps(_CONFIRMATION_SUFFIX)[1:].encode("utf-8") + b"}"
+
+
+def _confirmation_body(email: str, cadence_text: str) -> bytes:
+    """Assemble the confirmation email's JSON request body."""
+    return b"".join((
+        _CONFIRMATION_HEAD_B,
+        json.dumps(email).encode("utf-8"),
+        _CONFIRMATION_PREFIX_B,
+        json.dumps(cadence_text)[1:-1].encode("utf-8"),
+        _CONFIRMATION_SUFFIX_B,
+    ))
+
+
+def _post_email(api_key: str, body: bytes, url: str = RESEND_EMAILS_URL,
+                headers: Optional[dict] = None) -> requests.Response:
+    """Send one JSON-encoded email (or batch) through Resend's REST API. Raises on HTTP errors."""
+    response = _SESSION.post(
+        url,
+        data=body,
+        headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json",
+                 **(headers or {})},
+        timeout=10,
+    )
+    response.raise_for_status()
+    return response
+
+
+def send_confirmation_email(email: str, cadence: str) -> bool:
+    """Send a confirmation email via Resend."""
+    resend_api_key = os.environ.get("RESEND_API_KEY")
+
+    if not resend_api_key:
+        print("Warning: RESEND_API_KEY not set, skipping confirmation email")
+        return False
+
+    try:
+        cadence_text = CADENCE_TEXT.get(cadence, cadence)
+
+        _post_email(resend_api_key, _confirmation_body(email, cadence_text))
         return True
     except Exception as e:
         print(f"Error sending email: {e}")
         return False
 
 
+# Confirmation sends queued off the request path, drained by a daemon worker
+_email_queue: "queue.Queue[tuple[str, str]]" = queue.Queue()
+_email_worker: Optional[threading.Thread] = None
+_email_worker_lock = threading.Lock()
+
+
+def _email_worker_loop():
+    """Background sender for queued confirmation emails."""
+    while True:
+        email, cadence = _email_queue.get()
+        if not send_confirmation_email(email, cadence):
+            print(f"Warning: Confirmation email to {email} was not sent")
+
+
+def enqueue_confirmation_email(email: str, cadence: str):
+    """Queue a confirmation email and return immediately."""
+    global _email_worker
+    with _email_worker_lock:
+        if _email_worker is None:
+            _email_worker = threading.Thread(target=_email_worker_loop, name="confirmation-emails", daemon=True)
+            _email_worker.start()
+    _email_queue.put_nowait((email, cadence))
+
+
 # ---------------------------------------------------------------------------
 # Briefing emails
 # ---------------------------------------------------------------------------
@@ -226,6 +498,41 @@ METRIC_ICONS = {
 }
 
 
+# Static parts of the briefing email, shared by every regime and recipient
+_BRIEFING_HEAD = """
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <meta charset="utf-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    </head>
+    <body style="margin: 0; padding: 0; background-color: #0a0f1a; font-family: 'Segoe UI', system-ui, -apple-system, sans-serif;">
+        <div style="max-width: 520px; margin: 0 auto; padding: 48px 24px;">
+
+"""
+_BRIEFING_FOOTER = """            <!-- Footer -->
+            <div style="text-align: center; padding-top: 24px; border-top: 1px solid rgba(71, 85, 105, 0.2);">
+                <p style="margin: 0 0 8px 0; font-size: 12px; color: #64748B;">
+                    Reply to unsubscribe or share feedback
+                </p>
+                <p style="margin: 0; font-size: 10px; color: #334155;">
+                    Not financial advice. For educational purposes only.
+                </p>
+            </div>
+
+        </div>
+    </body>
+    </html>
+    """
+
+
+# Rendered briefings keyed by their canonicalised inputs, so a retried or
+# repeated send with the same data skips the template work. Oldest evicted first.
+_BRIEFING_CACHE_SIZE = 32
+_briefing_cache: dict = {}
+_briefing_cache_lock = threading.Lock()
+
+
 def _build_briefing_html(
     regime: str,
     score: float,
@@ -235,15 +542,46 @@ def _build_briefing_html(
     dashboard_url: str = "https://www.flowstate.markets",
     is_regime_change: bool = False,
     old_regime: str = None,
-) -> str:
-    """Build HTML email body for a regime briefing."""
+) -> tuple[str, str]:
+    """Build (HTML body, subject) for a regime briefing, memoised on its inputs."""
+    key = (
+        regime, score, json.dumps(scores, sort_keys=True, default=str),
+        btc_price, btc_200dma, dashboard_url, is_regime_change, old_regime,
+    )
+    with _briefing_cache_lock:
+        hit = _briefing_cache.get(key)
+    if hit is not None:
+        return hit
+
+    rendered = _render_briefing_html(
+        regime, score, scores, btc_price, btc_200dma,
+        dashboard_url, is_regime_change, old_regime,
+    )
+    with _briefing_cache_lock:
+        if len(_briefing_cache) >= _BRIEFING_CACHE_SIZE:
+            del _briefing_cache[next(iter(_briefing_cache))]
+        _briefing_cache[key] = rendered
+    return rendered
+
+
+def _render_briefing_html(
+    regime: str,
+    score: float,
+    scores: dict,
+    btc_price: float,
+    btc_200dma: float,
+    dashboard_url: str,
+    is_regime_change: bool,
+    old_regime: str,
+) -> tuple[str, str]:
+    """Render the HTML email body and subject for a regime briefing."""
     color = REGIME_COLORS_HEX.get(regime, "#3B82F6")
     emoji = REGIME_EMOJIS.get(regime, "📊")
     description = REGIME_DESCRIPTIONS.get(regime, "")
 
     # Build metric rows
     individual = scores.get("individual", {})
-    metric_rows = ""
+    row_parts = []
     for name, data in individual.items():
         sig = data.get("score", 0)
         if sig > 0:
@@ -258,7 +596,7 @@ def _build_briefing_html(
         icon = METRIC_ICONS.get(name, "📊")
         friendly = METRIC_NAMES.get(name, name.replace("_", " ").title())
         reason = data.get("reason", "")
-        metric_rows += f"""
+        row_parts.append(f"""
         <tr>
             <td style="padding: 10px 0; border-bottom: 1px solid rgba(71, 85, 105, 0.2);">
                 <span style="font-size: 14px;">{icon}</span>
@@ -273,7 +611,8 @@ def _build_briefing_html(
                 <span style="font-size: 11px; color: #64748B;">{reason}</span>
             </td>
         </tr>
-        """
+        """)
+    metric_rows = "".join(row_parts)
 
     # BTC section
     btc_price_str = f"${btc_price:,.0f}" if btc_price else "N/A"
@@ -292,17 +631,7 @@ def _build_briefing_html(
         header_text = regime.upper()
         header_subtext = "Daily liquidity briefing"
 
-    html = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <meta charset="utf-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    </head>
-    <body style="margin: 0; padding: 0; background-color: #0a0f1a; font-family: 'Segoe UI', system-ui, -apple-system, sans-serif;">
-        <div style="max-width: 520px; margin: 0 auto; padding: 48px 24px;">
-
-            <!-- Header Bar -->
+    html = _BRIEFING_HEAD + f"""            <!-- Header Bar -->
             <div style="background: {color}; height: 4px; border-radius: 2px; margin-bottom: 40px;"></div>
 
             <!-- Logo -->
@@ -351,20 +680,7 @@ def _build_briefing_html(
                 </a>
             </div>
 
-            <!-- Footer -->
-            <div style="text-align: center; padding-top: 24px; border-top: 1px solid rgba(71, 85, 105, 0.2);">
-                <p style="margin: 0 0 8px 0; font-size: 12px; color: #64748B;">
-                    Reply to unsubscribe or share feedback
-                </p>
-                <p style="margin: 0; font-size: 10px; color: #334155;">
-                    Not financial advice. For educational purposes only.
-                </p>
-            </div>
-
-        </div>
-    </body>
-    </html>
-    """
+""" + _BRIEFING_FOOTER
     return html, subject_prefix
 
 
@@ -385,27 +701,136 @@ def send_briefing_email(
         print("Warning: RESEND_API_KEY not set, skipping briefing email")
         return False
 
+    html, subject = _build_briefing_html(
+        regime=regime, score=score, scores=scores,
+        btc_price=btc_price, btc_200dma=btc_200dma,
+        dashboard_url=dashboard_url,
+        is_regime_change=is_regime_change, old_regime=old_regime,
+    )
+    return _send_prebuilt(resend_api_key, email, _briefing_head(html, subject))
+
+
+def _post_with_backoff(api_key: str, body: bytes, url: str, label: str,
+                       headers: Optional[dict] = None) -> Optional[requests.Response]:
+    """
+    Post to Resend, retrying transient (429/5xx) failures with jittered backoff.
+    Returns the final response (check .ok), or None if no response arrived.
+
+    Every attempt carries the same Idempotency-Key, derived from the request
+    itself, so a 5xx on a send Resend actually accepted isn't delivered twice.
+    """
+    headers = {
+        "Idempotency-Key": hashlib.sha256(url.encode("utf-8") + body).hexdigest(),
+        **(headers or {}),
+    }
+    for attempt in range(SEND_RETRIES + 1):
+        try:
+            return _post_email(api_key, body, url, headers)
+        except requests.HTTPError as e:
+            status = e.response.status_code if e.response is not None else 0
+            if (status == 429 or status >= 500) and attempt < SEND_RETRIES:
+                time.sleep(min(SEND_BACKOFF_CAP, SEND_BACKOFF_BASE * 2 ** attempt) + random.random())
+                continue
+            print(f"Error sending briefing email to {label}: {e}")
+            return e.response
+        except Exception as e:
+            print(f"Error sending briefing email to {label}: {e}")
+            return None
+    return None
+
+
+class _CircuitBreaker:
+    """Trips after `threshold` consecutive failures so a send run fails fast."""
+
+    def __init__(self, threshold: int):
+        self.threshold = threshold
+        self.failures = 0
+        self._lock = threading.Lock()
+
+    @property
+    def tripped(self) -> bool:
+        return self.failures >= self.threshold
+
+    def record(self, ok: bool):
+        with self._lock:
+            self.failures = 0 if ok else self.failures + 1
+
+    def trip(self):
+        """Open immediately, e.g. on an error no retry can fix."""
+        with self._lock:
+            self.failures = max(self.failures, self.threshold)
+
+
+def _briefing_head(html: str, subject: str) -> bytes:
+    """
+    JSON-encode a rendered briefing once, leaving the message open for its
+    recipient: head + json(email) + b"}" is one complete Resend message.
+    """
+    return json.dumps({
+        "from": "FlowState <alerts@flowstate.markets>",
+        "subject": subject,
+        "html": html,
+    })[:-1].encode("utf-8") + b', "to": '
+
+
+def _briefing_message(head: bytes, email: str) -> bytes:
+    """Close a pre-encoded briefing head around one recipient."""
+    return head + json.dumps(email).encode("utf-8") + b"}"
+
+
+def _send_prebuilt(api_key: str, email: str, head: bytes) -> bool:
+    """Send an already-encoded briefing to one recipient."""
+    response = _post_with_backoff(api_key, _briefing_message(head, email), RESEND_EMAILS_URL, email)
+    return response is not None and response.ok
+
+
+# Batch rejected for its payload: worth retrying one recipient at a time
+_BATCH_PAYLOAD_ERRORS = {400, 422}
+# Bad or revoked API key: every further request would fail the same way
+_AUTH_ERRORS = {401, 403}
+
+
+def _send_prebuilt_batch(api_key: str, emails: list[str], head: bytes,
+                         breaker: Optional[_CircuitBreaker] = None) -> int:
+    """
+    Send an already-encoded briefing to up to RESEND_BATCH_SIZE recipients
+    in one request. Returns how many recipients it was actually sent to.
+
+    Permissive validation makes Resend send every valid message and report
+    the rejected ones in the response's "errors", so one bad address doesn't
+    sink the batch. If the payload is still rejected as a whole (400/422),
+    it is retried one recipient at a time; an auth error (401/403) trips
+    `breaker` instead, since no other request can succeed either.
+    """
+    body = b"[" + b", ".join([_briefing_message(head, e) for e in emails]) + b"]"
+    label = f"batch of {len(emails)} ({emails[0]}...)"
+    response = _post_with_backoff(api_key, body, RESEND_BATCH_URL, label,
+                                  headers={"x-batch-validation": "permissive"})
+    if response is None:
+        return 0
+    if not response.ok:
+        if response.status_code in _AUTH_ERRORS:
+            if breaker is not None:
+                breaker.trip()
+            return 0
+        if response.status_code in _BATCH_PAYLOAD_ERRORS:
+            sent = 0
+            for email in emails:
+                if breaker is not None and breaker.tripped:
+                    break
+                sent += _send_prebuilt(api_key, email, head)
+            return sent
+        return 0
+
     try:
-        import resend
-        resend.api_key = resend_api_key
-
-        html, subject = _build_briefing_html(
-            regime=regime, score=score, scores=scores,
-            btc_price=btc_price, btc_200dma=btc_200dma,
-            dashboard_url=dashboard_url,
-            is_regime_change=is_regime_change, old_regime=old_regime,
-        )
-
-        resend.Emails.send({
-            "from": "FlowState <alerts@flowstate.markets>",
-            "to": email,
-            "subject": subject,
-            "html": html,
-        })
-        return True
-    except Exception as e:
-        print(f"Error sending briefing email to {email}: {e}")
-        return False
+        errors = response.json().get("errors") or []
+    except ValueError:
+        errors = []
+    for error in errors:
+        index = error.get("index")
+        email = emails[index] if isinstance(index, int) and 0 <= index < len(emails) else "?"
+        print(f"Error sending briefing email to {email}: {error.get('message')}")
+    return len(emails) - len(errors)
 
 
 def send_briefings_to_subscribers(
@@ -433,39 +858,52 @@ def send_briefings_to_subscribers(
         data = load_subscribers()
         subscribers = data.get("subscribers", [])
 
-    sent = 0
-    failed = 0
-    skipped = 0
-
-    for sub in subscribers:
-        cadence = sub.get("cadence", "daily")
-
-        # Filter by cadence
-        if is_regime_change and cadence == "on_change":
-            pass  # always send regime changes to on_change subscribers
-        elif daily and cadence in ("daily",):
-            pass  # daily subscribers get daily briefings
-        elif is_regime_change and cadence == "daily":
-            pass  # daily subscribers also get regime changes
-        elif daily and cadence == "weekly":
-            # Weekly subscribers: only send on Mondays
-            from datetime import datetime
-            if datetime.now().weekday() != 0:  # 0 = Monday
-                skipped += 1
-                continue
-        else:
-            skipped += 1
-            continue
-
-        success = send_briefing_email(
-            email=sub["email"], regime=regime, score=score, scores=scores,
-            btc_price=btc_price, btc_200dma=btc_200dma,
-            dashboard_url=dashboard_url,
-            is_regime_change=is_regime_change, old_regime=old_regime,
-        )
-        if success:
-            sent += 1
-        else:
-            failed += 1
+    # The briefing is identical for every recipient: render and encode it once
+    resend_api_key = os.environ.get("RESEND_API_KEY")
+    if not resend_api_key:
+        print("Warning: RESEND_API_KEY not set, skipping briefing email")
+    html, subject = _build_briefing_html(
+        regime=regime, score=score, scores=scores,
+        btc_price=btc_price, btc_200dma=btc_200dma,
+        dashboard_url=dashboard_url,
+        is_regime_change=is_regime_change, old_regime=old_regime,
+    )
+    head = _briefing_head(html, subject)
+
+    # Cadences that receive this send, decided once rather than per subscriber
+    allowed = set()
+    if is_regime_change:
+        allowed.update(("on_change", "daily"))  # daily subscribers also get regime changes
+    if daily:
+        allowed.add("daily")
+        if datetime.now().weekday() == 0:  # weekly subscribers: Mondays only
+            allowed.add("weekly")
+
+    targets = [sub["email"] for sub in subscribers if sub.get("cadence", "daily") in allowed]
+    skipped = len(subscribers) - len(targets)
+
+    if not resend_api_key:
+        return {"sent": 0, "failed": len(targets), "skipped": skipped}
+
+    # One request per RESEND_BATCH_SIZE recipients; batches are network-bound,
+    # so fan them out over the shared session
+    batches = [targets[i:i + RESEND_BATCH_SIZE] for i in range(0, len(targets), RESEND_BATCH_SIZE)]
+    breaker = _CircuitBreaker(SEND_BREAKER_THRESHOLD)
+
+    def send_batch(batch: list[str]) -> int:
+        # Once Resend keeps failing, count the remaining batches as failed
+        # instead of waiting out retries and timeouts for each of them
+        if breaker.tripped:
+            return 0
+        n = _send_prebuilt_batch(resend_api_key, batch, head, breaker)
+        if not breaker.tripped:
+            breaker.record(n > 0)
+        return n
+
+    with ThreadPoolExecutor(max_workers=SEND_WORKERS) as pool:
+        sent = sum(pool.map(send_batch, batches))
+    failed = len(targets) - sent
+    if breaker.tripped:
+        print(f"Warning: Resend failing repeatedly, stopped sending briefings after {breaker.failures} failed batches")
 
     return {"sent": sent, "failed": failed, "skipped": skipped}
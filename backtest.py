@@ -3,36 +3,116 @@ Backtesting script for regime threshold optimization.
 Fetches 2+ years of historical data and analyzes signal quality.
 """
 
+import functools
+import multiprocessing as mp
 import pandas as pd
 import numpy as np
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Tuple
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
 import os
 
+try:
+    from numba import njit
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pa = None
+
 from data.fetchers import fetch_fred_series, fetch_btc_price_history, fetch_stablecoin_history_combined
 from config import FRED_SERIES, METRIC_THRESHOLDS, WEIGHTS, REGIME_THRESHOLDS
 
+# Scored metrics, keyed by their WEIGHTS name:
+# (data key, value column, delta window in days, results column prefix, inverted)
+BACKTEST_METRICS = {
+    "walcl": ("walcl", "value", 28, "walcl", False),
+    "rrp": ("rrpontsyd", "value", 28, "rrp", True),
+    "hy_spread": ("bamlh0a0hym2", "value", 28, "hy", True),
+    "dxy": ("dtwexbgs", "value", 28, "dxy", True),
+    "stablecoin": ("stablecoins", "supply", 21, "stable", False),
+}
+
+# Fetched series are kept here between runs so threshold tuning doesn't refetch
+BACKTEST_CACHE_DIR = Path(__file__).parent / "cache"
+
+# Threshold keys and their fallbacks: ((bullish key, default), (bearish key, default))
+_THRESHOLD_KEYS = {
+    "walcl": (("walcl_delta_bullish", 0.005), ("walcl_delta_bearish", -0.005)),
+    "rrp": (("rrp_delta_bullish", -0.05), ("rrp_delta_bearish", 0.05)),
+    "hy_spread": (("hy_spread_bullish", -0.10), ("hy_spread_bearish", 0.10)),
+    "dxy": (("dxy_bullish", -0.02), ("dxy_bearish", 0.02)),
+    "stablecoin": (("stablecoin_bullish", 0.02), ("stablecoin_bearish", -0.02)),
+}
+
+
+def cached_parquet(ttl_hours: float = 24):
+    """
+    Cache a DataFrame-returning fetcher as zstd Parquet in BACKTEST_CACHE_DIR,
+    keyed by its name and arguments, reusing the file until it is ttl_hours old.
+    Empty results (how the fetchers report errors) are not cached.
+    """
+    def decorator(fetch):
+        @functools.wraps(fetch)
+        def wrapper(*args, **kwargs):
+            key = "_".join([fetch.__name__, *map(str, args),
+                            *(f"{k}={v}" for k, v in sorted(kwargs.items()))])
+            path = BACKTEST_CACHE_DIR / f"{key}.parquet"
+            if path.exists() and time.time() - path.stat().st_mtime < ttl_hours * 3600:
+                return pd.read_parquet(path)
+
+            df = fetch(*args, **kwargs)
+            if len(df) > 0:
+                BACKTEST_CACHE_DIR.mkdir(exist_ok=True)
+                df.to_parquet(path, compression="zstd", index=False)
+            return df
+        return wrapper
+    return decorator
+
+
+_fetch_fred_series = cached_parquet()(fetch_fred_series)
+_fetch_btc_price_history = cached_parquet()(fetch_btc_price_history)
+_fetch_stablecoin_history = cached_parquet()(fetch_stablecoin_history_combined)
+
 
 def fetch_historical_data(days_back: int = 730) -> Dict[str, pd.DataFrame]:
-    """Fetch 2+ years of historical data for backtesting."""
+    """Fetch 2+ years of historical data for backtesting (cached on disk for a day)."""
     print(f"Fetching {days_back} days of historical data...")
 
-    data = {}
+    # Every fetch is an independent HTTP call, so run them side by side
+    tasks = {
+        name.lower(): (_fetch_fred_series, (series_id,), {"days_back": days_back})
+        for name, series_id in FRED_SERIES.items()
+    }
+    # BTC price (need extra for 200 DMA)
+    tasks["btc"] = (_fetch_btc_price_history, (), {"days": days_back})
+    tasks["stablecoins"] = (_fetch_stablecoin_history, (), {})
 
-    # FRED series
-    for name, series_id in FRED_SERIES.items():
-        print(f"  Fetching {name}...")
-        data[name.lower()] = fetch_fred_series(series_id, days_back=days_back)
+    with ThreadPoolExecutor(max_workers=len(tasks)) as pool:
+        futures = {}
+        for name, (fetch, args, kwargs) in tasks.items():
+            print(f"  Fetching {name}...")
+            futures[name] = pool.submit(fetch, *args, **kwargs)
+        # Collected in submission order so the dict layout matches a serial fetch
+        return {name: future.result() for name, future in futures.items()}
 
-    # BTC price (need extra for 200 DMA)
-    print("  Fetching BTC...")
-    data["btc"] = fetch_btc_price_history(days=days_back)
 
-    # Stablecoins
-    print("  Fetching stablecoins...")
-    data["stablecoins"] = fetch_stablecoin_history_combined()
+def _sorted_by_date(df: pd.DataFrame) -> pd.DataFrame:
+    """Return df ordered by date, only sorting when it isn't already."""
+    if df["date"].is_monotonic_increasing:
+        return df
+    return df.sort_values("date", kind="mergesort", ignore_index=True)
 
-    return data
+
+def _rows_through(df: pd.DataFrame, target_date: datetime) -> int:
+    """Number of rows of a date-sorted frame dated on or before target_date."""
+    return int(df["date"].searchsorted(target_date, side="right"))
 
 
 def calculate_delta_at_date(df: pd.DataFrame, target_date: datetime,
@@ -41,24 +121,23 @@ def calculate_delta_at_date(df: pd.DataFrame, target_date: datetime,
     if df is None or len(df) == 0:
         return None
 
-    df = df.sort_values("date")
+    df = _sorted_by_date(df)
 
     # Get data up to target_date
-    df_at_date = df[df["date"] <= target_date]
-    if len(df_at_date) < 2:
+    n_at_date = _rows_through(df, target_date)
+    if n_at_date < 2:
         return None
 
     # Current value (at target_date)
-    current = df_at_date[value_col].iloc[-1]
+    current = df[value_col].iloc[n_at_date - 1]
 
     # Past value (days_back before target_date)
-    past_target = target_date - timedelta(days=days_back)
-    past_df = df_at_date[df_at_date["date"] <= past_target]
+    n_past = _rows_through(df, target_date - timedelta(days=days_back))
 
-    if len(past_df) == 0:
+    if n_past == 0:
         return None
 
-    past = past_df[value_col].iloc[-1]
+    past = df[value_col].iloc[n_past - 1]
 
     if past == 0 or pd.isna(past) or pd.isna(current):
         return None
@@ -66,19 +145,54 @@ def calculate_delta_at_date(df: pd.DataFrame, target_date: datetime,
     return (current - past) / abs(past)
 
 
+def _delta_series(df: pd.DataFrame, calendar: pd.DatetimeIndex,
+                  days_back: int, value_col: str = "value") -> pd.Series:
+    """calculate_delta_at_date for every calendar date at once (NaN where it returns None)."""
+    if df is None or len(df) == 0:
+        return pd.Series(np.nan, index=calendar)
+
+    df = _sorted_by_date(df)
+    dates = pd.DatetimeIndex(df["date"])
+    keep = ~dates.duplicated(keep="last")
+    obs_dates = dates[keep].to_numpy()
+    obs_values = df[value_col].to_numpy(dtype=float)[keep]
+
+    # Value as of each date and days_back earlier: last observation on or before it
+    cal = calendar.to_numpy()
+    cur_idx = np.searchsorted(obs_dates, cal, side="right") - 1
+    past_idx = np.searchsorted(obs_dates, cal - np.timedelta64(days_back, "D"), side="right") - 1
+    current = np.where(cur_idx >= 0, obs_values[np.maximum(cur_idx, 0)], np.nan)
+    past = np.where(past_idx >= 0, obs_values[np.maximum(past_idx, 0)], np.nan)
+
+    # Like calculate_delta_at_date: need two observations so far and a non-zero past
+    enough = dates.searchsorted(calendar, side="right") >= 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        delta = (current - past) / np.abs(past)
+    return pd.Series(np.where(enough & (past != 0), delta, np.nan), index=calendar)
+
+
+def precompute_deltas(data: Dict[str, pd.DataFrame],
+                      calendar: pd.DatetimeIndex) -> Dict[str, pd.Series]:
+    """Deltas for every backtest metric over a daily calendar, one pass per metric."""
+    return {
+        name: _delta_series(data.get(key), calendar, days_back, value_col)
+        for name, (key, value_col, days_back, _, _) in BACKTEST_METRICS.items()
+    }
+
+
 def calculate_ma_at_date(df: pd.DataFrame, target_date: datetime,
                          window: int, value_col: str = "price") -> float:
     """Calculate moving average at a given date."""
     if df is None or len(df) == 0:
         return None
 
-    df = df.sort_values("date")
-    df_at_date = df[df["date"] <= target_date]
+    df = _sorted_by_date(df)
+    n_at_date = _rows_through(df, target_date)
 
-    if len(df_at_date) < window:
+    if n_at_date < window:
         return None
 
-    return df_at_date[value_col].iloc[-window:].mean()
+    return df[value_col].iloc[n_at_date - window:n_at_date].mean()
 
 
 def score_metric(delta: float, bullish_thresh: float, bearish_thresh: float,
@@ -103,6 +217,94 @@ def score_metric(delta: float, bullish_thresh: float, bearish_thresh: float,
     return 0
 
 
+def score_metric_vec(delta: np.ndarray, bullish_thresh: float, bearish_thresh: float,
+                     inverted: bool = False) -> np.ndarray:
+    """score_metric over a whole array of deltas; NaN scores 0."""
+    if inverted:
+        conditions = [delta <= bullish_thresh, delta >= bearish_thresh]
+    else:
+        conditions = [delta >= bullish_thresh, delta <= bearish_thresh]
+    # NaN compares False on both sides, so missing deltas fall through to 0
+    return np.select(conditions, [1, -1], default=0).astype(np.int8)
+
+
+def _score_all_loop(deltas: np.ndarray, bulls: np.ndarray, bears: np.ndarray,
+                    inverted: np.ndarray, weights: np.ndarray):
+    """
+    Score every metric on every date and sum the weighted total in one pass.
+
+    deltas is float64[N, M] (NaN when missing); bulls/bears/inverted/weights
+    are per-metric vectors. Returns int8[N, M] scores and float64[N] totals.
+    """
+    n, m = deltas.shape
+    scores = np.zeros((n, m), dtype=np.int8)
+    total = np.zeros(n)
+    for i in range(n):
+        acc = 0.0
+        for j in range(m):
+            d = deltas[i, j]
+            s = 0
+            if inverted[j]:
+                if d <= bulls[j]:
+                    s = 1
+                elif d >= bears[j]:
+                    s = -1
+            else:
+                if d >= bulls[j]:
+                    s = 1
+                elif d <= bears[j]:
+                    s = -1
+            scores[i, j] = s
+            acc += s * weights[j]
+        total[i] = acc
+    return scores, total
+
+
+def _score_all_vectorized(deltas: np.ndarray, bulls: np.ndarray, bears: np.ndarray,
+                          inverted: np.ndarray, weights: np.ndarray):
+    """NumPy equivalent of _score_all_loop (NaN compares False -> 0)."""
+    # Flip inverted metrics so "bullish" is always the >= side
+    sign = np.where(inverted, -1.0, 1.0)
+    directed = deltas * sign
+    scores = (directed >= bulls * sign).view(np.int8) - (directed <= bears * sign).view(np.int8)
+    return scores, scores @ weights
+
+
+# Compiled eagerly for the one signature run_backtest uses, so the kernel is
+# native (and, via cache=True, loaded from disk) before any sweep worker forks
+_SCORE_ALL_SIGNATURE = ("Tuple((int8[:, :], float64[:]))"
+                        "(float64[:, :], float64[:], float64[:], boolean[:], float64[:])")
+
+if _NUMBA_AVAILABLE:
+    # No fastmath: missing deltas are NaN and must compare False
+    _score_all = njit(_SCORE_ALL_SIGNATURE, cache=True)(_score_all_loop)
+else:
+    _score_all = _score_all_vectorized
+
+
+def _metric_thresholds(name: str, thresholds: Dict[str, float]) -> Tuple[float, float]:
+    """(bullish, bearish) thresholds for a metric, falling back to its defaults."""
+    (bull_key, bull_default), (bear_key, bear_default) = _THRESHOLD_KEYS[name]
+    return thresholds.get(bull_key, bull_default), thresholds.get(bear_key, bear_default)
+
+
+def _btc_vs_ma_at_date(btc_df: pd.DataFrame, target_date: datetime) -> Optional[Dict[str, Any]]:
+    """BTC price and 200 DMA as of a date, or None without BTC data up to it."""
+    if btc_df is None or len(btc_df) == 0:
+        return None
+    btc_df = _sorted_by_date(btc_df)
+    n_at_date = _rows_through(btc_df, target_date)
+    if n_at_date == 0:
+        return None
+    btc_price = btc_df["price"].iloc[n_at_date - 1]
+    btc_ma = calculate_ma_at_date(btc_df, target_date, 200, "price")
+    return {
+        "price": btc_price,
+        "ma_200": btc_ma,
+        "above_ma": btc_price > btc_ma if btc_ma else None
+    }
+
+
 def calculate_regime_score_at_date(data: Dict[str, pd.DataFrame],
                                    target_date: datetime,
                                    thresholds: Dict[str, float] = None) -> Dict[str, Any]:
@@ -167,17 +369,9 @@ def calculate_regime_score_at_date(data: Dict[str, pd.DataFrame],
     scores["stablecoin"] = {"delta": stable_delta, "score": stable_score}
 
     # BTC vs 200 DMA
-    btc_df = data.get("btc")
-    if btc_df is not None and len(btc_df) > 0:
-        btc_at_date = btc_df[btc_df["date"] <= target_date]
-        if len(btc_at_date) > 0:
-            btc_price = btc_at_date["price"].iloc[-1]
-            btc_ma = calculate_ma_at_date(btc_df, target_date, 200, "price")
-            scores["btc"] = {
-                "price": btc_price,
-                "ma_200": btc_ma,
-                "above_ma": btc_price > btc_ma if btc_ma else None
-            }
+    btc = _btc_vs_ma_at_date(data.get("btc"), target_date)
+    if btc is not None:
+        scores["btc"] = btc
 
     # Calculate weighted total
     total = 0
@@ -200,22 +394,24 @@ def calculate_forward_returns(btc_df: pd.DataFrame, date: datetime,
     if btc_df is None or len(btc_df) == 0:
         return {w: None for w in windows}
 
-    btc_df = btc_df.sort_values("date")
-    at_date = btc_df[btc_df["date"] <= date]
+    btc_df = _sorted_by_date(btc_df)
+    n_at_date = _rows_through(btc_df, date)
 
-    if len(at_date) == 0:
+    if n_at_date == 0:
         return {w: None for w in windows}
 
-    start_price = at_date["price"].iloc[-1]
+    prices = btc_df["price"]
+    start_price = prices.iloc[n_at_date - 1]
     returns = {}
 
     for window in windows:
+        # First price within ±3 days of the target date
         future_date = date + timedelta(days=window)
-        future_df = btc_df[(btc_df["date"] >= future_date - timedelta(days=3)) &
-                           (btc_df["date"] <= future_date + timedelta(days=3))]
+        lo = int(btc_df["date"].searchsorted(future_date - timedelta(days=3), side="left"))
+        hi = _rows_through(btc_df, future_date + timedelta(days=3))
 
-        if len(future_df) > 0:
-            end_price = future_df["price"].iloc[0]
+        if hi > lo:
+            end_price = prices.iloc[lo]
             returns[window] = (end_price - start_price) / start_price
         else:
             returns[window] = None
@@ -223,6 +419,54 @@ def calculate_forward_returns(btc_df: pd.DataFrame, date: datetime,
     return returns
 
 
+def forward_returns_vec(btc_df: pd.DataFrame, calendar: pd.DatetimeIndex,
+                        windows: List[int] = [7, 30, 90]) -> Dict[int, np.ndarray]:
+    """
+    calculate_forward_returns for every calendar date at once (NaN where it
+    returns None). btc_df must be sorted by date.
+    """
+    dates = btc_df["date"].to_numpy(dtype="datetime64[ns]")
+    prices = btc_df["price"].to_numpy(dtype=float)
+    starts = calendar.to_numpy(dtype="datetime64[ns]")
+    tolerance = np.timedelta64(3, "D")
+
+    n_at_date = np.searchsorted(dates, starts, side="right")
+    start_price = np.where(n_at_date > 0, prices[np.maximum(n_at_date - 1, 0)], np.nan)
+
+    returns = {}
+    for window in windows:
+        # First price within ±3 days of each target date
+        targets = starts + np.timedelta64(window, "D")
+        lo = np.searchsorted(dates, targets - tolerance, side="left")
+        hi = np.searchsorted(dates, targets + tolerance, side="right")
+        end_price = np.where(hi > lo, prices[np.minimum(lo, len(prices) - 1)], np.nan)
+        returns[window] = (end_price - start_price) / start_price
+
+    return returns
+
+
+def btc_above_ma_vec(btc_df: pd.DataFrame, calendar: pd.DatetimeIndex,
+                     window: int = 200) -> List[Optional[bool]]:
+    """
+    Whether BTC closed above its moving average on every calendar date.
+    Vectorized equivalent of _btc_vs_ma_at_date(...)["above_ma"]: None before
+    the first price, or where fewer than `window` prices exist yet.
+    """
+    btc_df = _sorted_by_date(btc_df)
+    prices = btc_df["price"].to_numpy(dtype=float)
+    # One running-sum pass over the rows instead of a fresh slice mean per date;
+    # min_periods=1 skips NaN prices the same way the slice mean does
+    ma = btc_df["price"].rolling(window, min_periods=1).mean().to_numpy(dtype=float)
+
+    n_at_date = np.searchsorted(btc_df["date"].to_numpy(), calendar.to_numpy(), side="right")
+    row = np.maximum(n_at_date - 1, 0)
+    price, ma = prices[row], ma[row]
+
+    # A zero average is falsy in the per-date helper, so it reports None too
+    above = np.where((n_at_date >= window) & (ma != 0), price > ma, None)
+    return above.tolist()
+
+
 def run_backtest(data: Dict[str, pd.DataFrame],
                  start_date: datetime = None,
                  end_date: datetime = None,
@@ -237,7 +481,9 @@ def run_backtest(data: Dict[str, pd.DataFrame],
         print("No BTC data available")
         return pd.DataFrame()
 
-    btc_dates = btc_df["date"].sort_values()
+    # Sort once so the per-date helpers below can binary-search it
+    btc_df = _sorted_by_date(btc_df)
+    btc_dates = btc_df["date"]
 
     if start_date is None:
         # Start 230 days in (to have enough history for 200 DMA + 28 day delta)
@@ -249,40 +495,99 @@ def run_backtest(data: Dict[str, pd.DataFrame],
 
     print(f"Running backtest from {start_date.date()} to {end_date.date()}")
 
-    results = []
-    current_date = start_date
-
-    while current_date <= end_date:
-        # Calculate regime score
-        score_data = calculate_regime_score_at_date(data, current_date, thresholds)
-
-        # Calculate forward returns
-        forward_returns = calculate_forward_returns(btc_df, current_date)
-
-        # Combine results
-        result = {
-            "date": current_date,
-            "total_score": score_data["total_score"],
-            "walcl_delta": score_data["individual"]["walcl"]["delta"],
-            "walcl_score": score_data["individual"]["walcl"]["score"],
-            "rrp_delta": score_data["individual"]["rrp"]["delta"],
-            "rrp_score": score_data["individual"]["rrp"]["score"],
-            "hy_delta": score_data["individual"]["hy_spread"]["delta"],
-            "hy_score": score_data["individual"]["hy_spread"]["score"],
-            "dxy_delta": score_data["individual"]["dxy"]["delta"],
-            "dxy_score": score_data["individual"]["dxy"]["score"],
-            "stable_delta": score_data["individual"]["stablecoin"]["delta"],
-            "stable_score": score_data["individual"]["stablecoin"]["score"],
-            "btc_above_ma": score_data["individual"].get("btc", {}).get("above_ma"),
-            "return_7d": forward_returns.get(7),
-            "return_30d": forward_returns.get(30),
-            "return_90d": forward_returns.get(90),
-        }
-        results.append(result)
-
-        current_date += timedelta(days=1)
-
-    return pd.DataFrame(results)
+    if thresholds is None:
+        thresholds = METRIC_THRESHOLDS
+
+    # Deltas for the whole period up front instead of re-filtering every frame per date
+    calendar = pd.date_range(start_date, end_date, freq="D")
+    deltas = precompute_deltas(data, calendar)
+    metric_thresholds = {name: _metric_thresholds(name, thresholds) for name in BACKTEST_METRICS}
+
+    # Score every metric on every date, and the weighted total, in one kernel call
+    names = list(BACKTEST_METRICS)
+    delta_matrix = np.column_stack([deltas[name].to_numpy(dtype=float) for name in names])
+    bulls, bears = np.array([metric_thresholds[name] for name in names], dtype=float).T
+    inverted = np.array([BACKTEST_METRICS[name][4] for name in names])
+    weights = np.array([WEIGHTS[name] for name in names], dtype=float)
+    scores, total = _score_all(delta_matrix, np.ascontiguousarray(bulls),
+                               np.ascontiguousarray(bears), inverted, weights)
+
+    # Scoring ran on float64 deltas so threshold comparisons are unchanged;
+    # only the stored columns are narrowed (scores are int8 already)
+    columns = {"date": calendar, "total_score": total.astype(np.float32)}
+    for j, name in enumerate(names):
+        prefix = BACKTEST_METRICS[name][3]
+        columns[f"{prefix}_delta"] = delta_matrix[:, j].astype(np.float32)
+        columns[f"{prefix}_score"] = scores[:, j]
+
+    columns["btc_above_ma"] = btc_above_ma_vec(btc_df, calendar)
+
+    # Forward returns for every date in one pass per window
+    for window, returns in forward_returns_vec(btc_df, calendar).items():
+        columns[f"return_{window}d"] = returns
+
+    return pd.DataFrame(columns)
+
+
+# Data shared with forked sweep workers (inherited copy-on-write, not pickled)
+_sweep_data: Optional[Dict[str, pd.DataFrame]] = None
+
+
+def _sweep_worker(thresholds: Dict[str, float],
+                  data: Optional[Dict[str, pd.DataFrame]] = None) -> pd.DataFrame:
+    """Run one backtest of a sweep, on inherited data unless given explicitly."""
+    return run_backtest(data if data is not None else _sweep_data, thresholds=thresholds)
+
+
+def sweep_backtests(data: Dict[str, pd.DataFrame],
+                    threshold_grid: List[Dict[str, float]],
+                    max_workers: Optional[int] = None) -> List[pd.DataFrame]:
+    """
+    Run run_backtest once per threshold set across worker processes.
+    Returns the result frames in threshold_grid order.
+    """
+    global _sweep_data
+
+    # Sort every frame once here rather than in each run
+    data = {
+        name: _sorted_by_date(df) if isinstance(df, pd.DataFrame) and len(df) > 0 else df
+        for name, df in data.items()
+    }
+
+    # Forked workers inherit the fetched data for free; elsewhere it is pickled per task
+    if "fork" in mp.get_all_start_methods():
+        _sweep_data = data
+        try:
+            with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count(),
+                                     mp_context=mp.get_context("fork")) as pool:
+                return list(pool.map(_sweep_worker, threshold_grid))
+        finally:
+            _sweep_data = None
+
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as pool:
+        return list(pool.map(functools.partial(_sweep_worker, data=data), threshold_grid))
+
+
+# Total-score buckets for the forward-return breakdown: right-closed intervals
+# (-7, -4], (-4, -1], (-1, 1], (1, 4], (4, 7]
+SCORE_BUCKET_LABELS = ("Very Bearish", "Bearish", "Neutral", "Bullish", "Very Bullish")
+SCORE_BUCKET_EDGES = (-4, -1, 1, 4)
+SCORE_BUCKET_RANGE = (-7, 7)
+
+# Percentiles reported per metric in delta_statistics
+DELTA_QUANTILES = (0.10, 0.25, 0.50, 0.75, 0.90)
+
+
+def _summary_stats(values: np.ndarray) -> Dict[str, float]:
+    """Mean, sample std, min and max of a NaN-free array (pandas conventions)."""
+    if len(values) == 0:
+        return {"mean": np.nan, "std": np.nan, "min": np.nan, "max": np.nan}
+    return {
+        "mean": values.mean(),
+        "std": values.std(ddof=1) if len(values) > 1 else np.nan,
+        "min": values.min(),
+        "max": values.max(),
+    }
 
 
 def analyze_results(df: pd.DataFrame) -> Dict[str, Any]:
@@ -290,18 +595,16 @@ def analyze_results(df: pd.DataFrame) -> Dict[str, Any]:
     if len(df) == 0:
         return {}
 
+    total_score = df["total_score"].to_numpy(dtype=np.float64)
+    total_score = total_score[~np.isnan(total_score)]
+
     analysis = {
         "period": {
             "start": df["date"].min().strftime("%Y-%m-%d"),
             "end": df["date"].max().strftime("%Y-%m-%d"),
             "days": len(df),
         },
-        "score_distribution": {
-            "mean": df["total_score"].mean(),
-            "std": df["total_score"].std(),
-            "min": df["total_score"].min(),
-            "max": df["total_score"].max(),
-        },
+        "score_distribution": _summary_stats(total_score),
         "signal_frequency": {},
         "return_by_score": {},
         "delta_statistics": {},
@@ -311,12 +614,15 @@ def analyze_results(df: pd.DataFrame) -> Dict[str, Any]:
     for metric in ["walcl", "rrp", "hy", "dxy", "stable"]:
         col = f"{metric}_score"
         if col in df.columns:
-            counts = df[col].value_counts()
+            # Scores are confined to {-1, 0, 1}: shift to {0, 1, 2} and bincount
+            bearish, neutral, bullish = np.bincount(
+                df[col].to_numpy(dtype=np.intp) + 1, minlength=3
+            )[:3]
             total = len(df)
             analysis["signal_frequency"][metric] = {
-                "bullish": counts.get(1, 0) / total * 100,
-                "neutral": counts.get(0, 0) / total * 100,
-                "bearish": counts.get(-1, 0) / total * 100,
+                "bullish": bullish / total * 100,
+                "neutral": neutral / total * 100,
+                "bearish": bearish / total * 100,
             }
 
     # Delta statistics
@@ -324,40 +630,54 @@ def analyze_results(df: pd.DataFrame) -> Dict[str, Any]:
                         ("hy", "hy_delta"), ("dxy", "dxy_delta"),
                         ("stable", "stable_delta")]:
         if col in df.columns:
-            deltas = df[col].dropna()
+            deltas = df[col].to_numpy(dtype=np.float64)
+            deltas = deltas[~np.isnan(deltas)]
             if len(deltas) > 0:
+                p10, p25, p50, p75, p90 = np.quantile(deltas, DELTA_QUANTILES) * 100
                 analysis["delta_statistics"][metric] = {
-                    "mean": deltas.mean() * 100,
-                    "std": deltas.std() * 100,
-                    "min": deltas.min() * 100,
-                    "max": deltas.max() * 100,
-                    "p10": deltas.quantile(0.10) * 100,
-                    "p25": deltas.quantile(0.25) * 100,
-                    "p50": deltas.quantile(0.50) * 100,
-                    "p75": deltas.quantile(0.75) * 100,
-                    "p90": deltas.quantile(0.90) * 100,
+                    **{k: v * 100 for k, v in _summary_stats(deltas).items()},
+                    "p10": p10,
+                    "p25": p25,
+                    "p50": p50,
+                    "p75": p75,
+                    "p90": p90,
                 }
 
     # Returns by score bucket
-    df_with_returns = df.dropna(subset=["return_30d"])
-    if len(df_with_returns) > 0:
-        # Create score buckets
-        df_with_returns = df_with_returns.copy()
-        df_with_returns["score_bucket"] = pd.cut(
-            df_with_returns["total_score"],
-            bins=[-7, -4, -1, 1, 4, 7],
-            labels=["Very Bearish", "Bearish", "Neutral", "Bullish", "Very Bullish"]
-        )
-
-        for bucket in ["Very Bearish", "Bearish", "Neutral", "Bullish", "Very Bullish"]:
-            bucket_data = df_with_returns[df_with_returns["score_bucket"] == bucket]
-            if len(bucket_data) > 0:
+    # Rows with a 30d return, as a mask over plain arrays rather than a filtered frame copy
+    returns = {window: df[f"return_{window}d"].to_numpy(dtype=np.float64) for window in (7, 30, 90)}
+    has_return = ~np.isnan(returns[30])
+    if has_return.any():
+        returns = {window: r[has_return] for window, r in returns.items()}
+        # Bucket index per row: (-7, -4] -> 0 ... (4, 7] -> 4
+        scores = df["total_score"].to_numpy(dtype=np.float64)[has_return]
+        bucket_idx = np.digitize(scores, SCORE_BUCKET_EDGES, right=True)
+        n_buckets = len(SCORE_BUCKET_LABELS)
+        # Out-of-range scores go to a spare trailing bin that is never reported
+        bucket_idx[(scores <= SCORE_BUCKET_RANGE[0]) | (scores > SCORE_BUCKET_RANGE[1])] = n_buckets
+
+        # Per-bucket counts, NaN-skipping means and win rate from a few bincount passes
+        def bucket_sum(weights=None):
+            return np.bincount(bucket_idx, weights=weights, minlength=n_buckets + 1)[:n_buckets]
+
+        counts = bucket_sum()
+        avg_returns = {}
+        for window, r in returns.items():
+            valid = ~np.isnan(r)
+            sums = bucket_sum(np.where(valid, r, 0.0))
+            n_valid = bucket_sum(valid.astype(np.float64))
+            with np.errstate(invalid="ignore", divide="ignore"):
+                avg_returns[window] = np.where(n_valid > 0, sums / n_valid, np.nan)
+        wins = bucket_sum((returns[30] > 0).astype(np.float64))
+
+        for i, bucket in enumerate(SCORE_BUCKET_LABELS):
+            if counts[i] > 0:
                 analysis["return_by_score"][bucket] = {
-                    "count": len(bucket_data),
-                    "avg_return_7d": bucket_data["return_7d"].mean() * 100,
-                    "avg_return_30d": bucket_data["return_30d"].mean() * 100,
-                    "avg_return_90d": bucket_data["return_90d"].mean() * 100,
-                    "win_rate_30d": (bucket_data["return_30d"] > 0).mean() * 100,
+                    "count": int(counts[i]),
+                    "avg_return_7d": avg_returns[7][i] * 100,
+                    "avg_return_30d": avg_returns[30][i] * 100,
+                    "avg_return_90d": avg_returns[90][i] * 100,
+                    "win_rate_30d": wins[i] / counts[i] * 100,
                 }
 
     return analysis
@@ -461,6 +781,14 @@ def print_analysis(analysis: Dict[str, Any]):
         print("\nNo major threshold issues detected.")
 
 
+def write_results_csv(df: pd.DataFrame, path: str):
+    """Write backtest results as CSV, with Arrow's C++ writer when pyarrow is installed."""
+    if pa is None:
+        df.to_csv(path, index=False)
+        return
+    pa_csv.write_csv(pa.Table.from_pandas(df, preserve_index=False), path)
+
+
 def main():
     """Main entry point for backtesting."""
     print("="*70)
@@ -491,7 +819,7 @@ def main():
         return
 
     # Save raw results
-    results_df.to_csv("backtest_results.csv", index=False)
+    write_results_csv(results_df, "backtest_results.csv")
     print(f"\nRaw results saved to backtest_results.csv ({len(results_df)} rows)")
 
     # Analyze
@@ -8,30 +8,48 @@ import pickle
 import pandas as pd
 import numpy as np
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+try:
+    from numba import njit
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
 
 from config import METRIC_THRESHOLDS, WEIGHTS
+from data.cache import unpack_frames
 
 
-def load_from_cache() -> Dict[str, Any]:
-    """Load whatever data is in the cache."""
+def load_from_cache(keys: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """Load whatever data is in the cache, or only the given keys."""
     db_path = Path(__file__).parent / "cache.db"
 
+    query = "SELECT key, data, timestamp FROM cache"
+    params: tuple = ()
+    if keys is not None:
+        # key is the PRIMARY KEY, so this is an index lookup per key
+        params = tuple(keys)
+        query += f" WHERE key IN ({', '.join('?' * len(params))})"
+
     data = {}
     with sqlite3.connect(db_path) as conn:
-        cursor = conn.execute("SELECT key, data, timestamp FROM cache")
-        rows = cursor.fetchall()
-
-        for key, data_blob, timestamp in rows:
-            try:
-                data[key] = {
-                    "data": pickle.loads(data_blob),
-                    "timestamp": timestamp
-                }
-            except Exception as e:
-                print(f"Error loading {key}: {e}")
+        cursor = conn.execute(query, params)
+
+        # Fetch rows in batches of 64 rather than holding every blob at once
+        while rows := cursor.fetchmany(64):
+            for key, data_blob, timestamp in rows:
+                try:
+                    # DataFrames are stored as Parquet blobs by CacheManager; older
+                    # entries holding pickled frames pass through unpack_frames unchanged
+                    data[key] = {
+                        "data": unpack_frames(pickle.loads(data_blob)),
+                        "timestamp": timestamp
+                    }
+                except Exception as e:
+                    print(f"Error loading {key}: {e}")
 
     return data
 
@@ -79,25 +97,30 @@ def fetch_stablecoins_free() -> pd.DataFrame:
         if not data:
             return pd.DataFrame(columns=["date", "supply"])
 
-        records = []
+        # Pull out the raw fields once; conversion and summing happen column-wise below
+        timestamps, circulating = [], []
         for item in data:
             try:
-                date_val = item.get("date", 0)
-                if isinstance(date_val, str):
-                    date_val = int(date_val)
-                date = datetime.fromtimestamp(date_val)
-
-                total_circ = item.get("totalCirculatingUSD", {})
-                if isinstance(total_circ, dict):
-                    total = sum(v for v in total_circ.values() if isinstance(v, (int, float)))
-                else:
-                    total = 0
-
-                records.append({"date": date, "supply": total})
+                timestamps.append(int(item.get("date", 0)))
             except (ValueError, TypeError):
                 continue
-
-        df = pd.DataFrame(records)
+            total_circ = item.get("totalCirculatingUSD", {})
+            circulating.append(total_circ if isinstance(total_circ, dict) else {})
+
+        # One column per pegged currency, gaps skipped. Only a column that mixes
+        # in non-numeric values needs a per-cell pass, and there only those
+        # values are dropped (not the whole currency)
+        circ_df = pd.DataFrame(circulating)
+        for col in circ_df.columns[circ_df.dtypes == object]:
+            circ_df[col] = circ_df[col].map(
+                lambda v: v if isinstance(v, (int, float)) else np.nan
+            ).astype(np.float64)
+        supply = circ_df.sum(axis=1, numeric_only=True)
+
+        df = pd.DataFrame({
+            "date": pd.to_datetime(np.asarray(timestamps, dtype=np.int64), unit="s"),
+            "supply": supply.to_numpy(dtype=np.float64),
+        })
         df = df.sort_values("date").reset_index(drop=True)
 
         return df
@@ -107,25 +130,36 @@ def fetch_stablecoins_free() -> pd.DataFrame:
         return pd.DataFrame(columns=["date", "supply"])
 
 
+def _sorted_by_date(df: pd.DataFrame) -> pd.DataFrame:
+    """Return df ordered by date, only sorting when it isn't already."""
+    if df["date"].is_monotonic_increasing:
+        return df
+    return df.sort_values("date", kind="mergesort", ignore_index=True)
+
+
+def _rows_through(df: pd.DataFrame, target_date: datetime) -> int:
+    """Number of rows of a date-sorted frame dated on or before target_date."""
+    return int(df["date"].searchsorted(target_date, side="right"))
+
+
 def calculate_delta_at_date(df: pd.DataFrame, target_date: datetime,
                             days_back: int, value_col: str = "value") -> Optional[float]:
     """Calculate the delta that would have been computed on a given date."""
     if df is None or len(df) == 0:
         return None
 
-    df = df.sort_values("date")
-    df_at_date = df[df["date"] <= target_date]
-    if len(df_at_date) < 2:
+    df = _sorted_by_date(df)
+    n_at_date = _rows_through(df, target_date)
+    if n_at_date < 2:
         return None
 
-    current = df_at_date[value_col].iloc[-1]
-    past_target = target_date - timedelta(days=days_back)
-    past_df = df_at_date[df_at_date["date"] <= past_target]
+    current = df[value_col].iloc[n_at_date - 1]
+    n_past = _rows_through(df, target_date - timedelta(days=days_back))
 
-    if len(past_df) == 0:
+    if n_past == 0:
         return None
 
-    past = past_df[value_col].iloc[-1]
+    past = df[value_col].iloc[n_past - 1]
 
     if past == 0 or pd.isna(past) or pd.isna(current):
         return None
@@ -139,13 +173,86 @@ def calculate_ma_at_date(df: pd.DataFrame, target_date: datetime,
     if df is None or len(df) == 0:
         return None
 
-    df = df.sort_values("date")
-    df_at_date = df[df["date"] <= target_date]
+    df = _sorted_by_date(df)
+    n_at_date = _rows_through(df, target_date)
 
-    if len(df_at_date) < window:
+    if n_at_date < window:
         return None
 
-    return df_at_date[value_col].iloc[-window:].mean()
+    return df[value_col].iloc[n_at_date - window:n_at_date].mean()
+
+
+def _rolling_delta_loop(times: np.ndarray, values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Delta of each value against the last one at least `window` earlier.
+
+    times is sorted int64 (any unit, same as window); NaN where there is no
+    usable past value, mirroring the None cases of calculate_delta_at_date.
+    """
+    n = len(values)
+    out = np.full(n, np.nan)
+    j = -1
+    for i in range(n):
+        # Lagged pointer only ever moves forward: amortized O(N) overall
+        while j + 1 < n and times[j + 1] <= times[i] - window:
+            j += 1
+        if i < 1 or j < 0:
+            continue
+        past = values[j]
+        current = values[i]
+        if past == 0 or np.isnan(past) or np.isnan(current):
+            continue
+        out[i] = (current - past) / abs(past)
+    return out
+
+
+def _rolling_delta_vectorized(times: np.ndarray, values: np.ndarray, window: int) -> np.ndarray:
+    """NumPy equivalent of _rolling_delta_loop."""
+    # Last row on or before each time minus the window
+    past_idx = np.searchsorted(times, times - window, side="right") - 1
+    past = np.where(past_idx >= 0, values[np.maximum(past_idx, 0)], np.nan)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        delta = (values - past) / np.abs(past)
+    valid = (np.arange(len(values)) >= 1) & (past != 0) & ~np.isnan(past) & ~np.isnan(values)
+    return np.where(valid, delta, np.nan)
+
+
+if _NUMBA_AVAILABLE:
+    # No fastmath: missing values are NaN and must be detected
+    _rolling_delta = njit(cache=True)(_rolling_delta_loop)
+else:
+    _rolling_delta = _rolling_delta_vectorized
+
+
+def rolling_deltas(df: pd.DataFrame, window: int, value_col: str = "value") -> np.ndarray:
+    """
+    calculate_delta_at_date for every row of a date-sorted frame in one pass.
+    Entry i is the delta as of row i's date using rows up to i (NaN where it returns None).
+    """
+    times = df["date"].to_numpy().astype("datetime64[ns]").view(np.int64)
+    values = df[value_col].to_numpy(dtype=np.float64)
+    return _rolling_delta(times, values, window * 86_400 * 10**9)
+
+
+# (id(input frame), window, value column) -> (input frame, sorted frame, deltas);
+# lets the analyzers of one run share work on the same frame. The input frame is
+# kept in the entry so its id cannot be reused while the entry exists.
+_delta_cache: Dict[Tuple[int, int, str], Tuple[pd.DataFrame, pd.DataFrame, np.ndarray]] = {}
+
+
+def sorted_rolling_deltas(df: pd.DataFrame, window: int,
+                          value_col: str = "value") -> Tuple[pd.DataFrame, np.ndarray]:
+    """Date-sorted df and its rolling_deltas, memoized per input frame."""
+    key = (id(df), window, value_col)
+    cached = _delta_cache.get(key)
+    if cached is not None and cached[0] is df:
+        return cached[1], cached[2]
+
+    sorted_df = df.sort_values("date")
+    deltas = rolling_deltas(sorted_df, window, value_col)
+    _delta_cache[key] = (df, sorted_df, deltas)
+    return sorted_df, deltas
 
 
 def score_metric(delta: float, bullish_thresh: float, bearish_thresh: float,
@@ -188,9 +295,13 @@ def run_analysis_with_available_data():
     print("LIQUIDITY REGIME THRESHOLD ANALYSIS")
     print("="*70)
 
+    # Deltas are shared between the analyzers within a run, never across runs
+    _delta_cache.clear()
+
     # Load cached data
     print("\nLoading cached data...")
-    cache_data = load_from_cache()
+    # Only the combined snapshot is used below; skip deserializing the rest
+    cache_data = load_from_cache(keys=["all_data"])
 
     if cache_data:
         print(f"Found {len(cache_data)} cached entries")
@@ -205,14 +316,18 @@ def run_analysis_with_available_data():
             if len(df) > 0:
                 print(f"  {key}: {len(df)} records, {df['date'].min().date()} to {df['date'].max().date()}")
 
-    # Fetch fresh data from free APIs
-    print("\nFetching BTC data (free API)...")
-    btc_df = fetch_btc_free(days=365)
-    if len(btc_df) > 0:
-        print(f"  BTC: {len(btc_df)} records, {btc_df['date'].min().date()} to {btc_df['date'].max().date()}")
+    # Fetch fresh data from free APIs; both requests are in flight at once
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        btc_future = pool.submit(fetch_btc_free, days=365)
+        stable_future = pool.submit(fetch_stablecoins_free)
 
-    print("\nFetching stablecoin data (free API)...")
-    stable_df = fetch_stablecoins_free()
+        print("\nFetching BTC data (free API)...")
+        btc_df = btc_future.result()
+        if len(btc_df) > 0:
+            print(f"  BTC: {len(btc_df)} records, {btc_df['date'].min().date()} to {btc_df['date'].max().date()}")
+
+        print("\nFetching stablecoin data (free API)...")
+        stable_df = stable_future.result()
     if len(stable_df) > 0:
         print(f"  Stablecoins: {len(stable_df)} records, {stable_df['date'].min().date()} to {stable_df['date'].max().date()}")
 
@@ -261,24 +376,15 @@ def analyze_metric_deltas(df: pd.DataFrame, window: int, value_col: str, metric_
         print(f"  Not enough data for {metric_name}")
         return
 
-    df = df.sort_values("date")
-
     # Calculate rolling deltas
-    deltas = []
-    for i in range(window, len(df)):
-        target_date = df["date"].iloc[i]
-        delta = calculate_delta_at_date(df.iloc[:i+1].copy(), target_date, window, value_col)
-        if delta is not None:
-            deltas.append({
-                "date": target_date,
-                "delta": delta
-            })
-
-    if not deltas:
+    df, deltas = sorted_rolling_deltas(df, window, value_col)
+    deltas = deltas[window:]
+    valid = ~np.isnan(deltas)
+    if not valid.any():
         print(f"  Could not calculate deltas for {metric_name}")
         return
 
-    deltas_df = pd.DataFrame(deltas)
+    deltas_df = pd.DataFrame({"date": df["date"].to_numpy()[window:][valid], "delta": deltas[valid]})
     delta_series = deltas_df["delta"]
 
     print(f"  Period: {deltas_df['date'].min().date()} to {deltas_df['date'].max().date()}")
@@ -326,46 +432,36 @@ def analyze_stablecoin_vs_btc(stable_df: pd.DataFrame, btc_df: pd.DataFrame):
     stable_df = stable_df.sort_values("date")
     btc_df = btc_df.sort_values("date")
 
-    results = []
-
-    for i in range(21, len(stable_df) - 30):  # Need 21 days back, 30 days forward
-        target_date = stable_df["date"].iloc[i]
-
-        # Calculate stablecoin delta
-        delta = calculate_delta_at_date(stable_df.iloc[:i+1].copy(), target_date, 21, "supply")
-        if delta is None:
-            continue
-
-        # Find BTC price at this date
-        btc_at_date = btc_df[btc_df["date"] <= target_date]
-        if len(btc_at_date) == 0:
-            continue
-        start_price = btc_at_date["price"].iloc[-1]
-
-        # Find BTC price 30 days later
-        future_date = target_date + timedelta(days=30)
-        btc_future = btc_df[(btc_df["date"] >= future_date - timedelta(days=3)) &
-                           (btc_df["date"] <= future_date + timedelta(days=3))]
-        if len(btc_future) == 0:
-            continue
-        end_price = btc_future["price"].iloc[0]
-
-        btc_return = (end_price - start_price) / start_price
-
-        # Score the signal with current thresholds
-        score = score_metric(delta, 0.02, -0.02, inverted=False)
-
-        results.append({
-            "date": target_date,
-            "stable_delta": delta,
-            "score": score,
-            "btc_return_30d": btc_return
-        })
-
-    if not results:
+    # Need 21 days back, 30 days forward
+    rows = slice(21, max(len(stable_df) - 30, 21))
+    dates = stable_df["date"].to_numpy()[rows]
+    deltas = rolling_deltas(stable_df, 21, "supply")[rows]
+
+    # BTC price at each date, and the first one within 3 days of 30 days later
+    btc_dates = btc_df["date"].to_numpy()
+    btc_prices = btc_df["price"].to_numpy(dtype=np.float64)
+    n_at_date = np.searchsorted(btc_dates, dates, side="right")
+    future = dates + np.timedelta64(30, "D")
+    lo = np.searchsorted(btc_dates, future - np.timedelta64(3, "D"), side="left")
+    hi = np.searchsorted(btc_dates, future + np.timedelta64(3, "D"), side="right")
+
+    keep = ~np.isnan(deltas) & (n_at_date > 0) & (hi > lo)
+    start_price = btc_prices[n_at_date[keep] - 1]
+    end_price = btc_prices[lo[keep]]
+    deltas = deltas[keep]
+
+    if len(deltas) == 0:
         print("  Not enough overlapping data")
         return
 
+    # Score the signal with current thresholds
+    results = {
+        "date": dates[keep],
+        "stable_delta": deltas,
+        "score": np.select([deltas >= 0.02, deltas <= -0.02], [1, -1], default=0),
+        "btc_return_30d": (end_price - start_price) / start_price,
+    }
+
     results_df = pd.DataFrame(results)
 
     print(f"\n  Analysis period: {results_df['date'].min().date()} to {results_df['date'].max().date()}")
@@ -388,21 +484,29 @@ def analyze_stablecoin_vs_btc(stable_df: pd.DataFrame, btc_df: pd.DataFrame):
     print(f"  {'Threshold':>10} {'Bull%':>7} {'Bear%':>7} {'Bull Ret':>10} {'Bear Ret':>10} {'Spread':>10}")
     print("  " + "-"*60)
 
-    for thresh in [0.01, 0.015, 0.02, 0.025, 0.03, 0.04, 0.05]:
-        results_df["test_score"] = results_df["stable_delta"].apply(
-            lambda x: 1 if x >= thresh else (-1 if x <= -thresh else 0)
-        )
-
-        bull = results_df[results_df["test_score"] == 1]
-        bear = results_df[results_df["test_score"] == -1]
-
-        bull_pct = len(bull) / len(results_df) * 100
-        bear_pct = len(bear) / len(results_df) * 100
-
-        bull_ret = bull["btc_return_30d"].mean() * 100 if len(bull) > 0 else 0
-        bear_ret = bear["btc_return_30d"].mean() * 100 if len(bear) > 0 else 0
+    # Every threshold at once: one (thresholds x dates) mask per side
+    threshs = np.array([0.01, 0.015, 0.02, 0.025, 0.03, 0.04, 0.05])
+    deltas = results_df["stable_delta"].to_numpy()
+    returns = results_df["btc_return_30d"].to_numpy(dtype=np.float64)
+    bull_mask = deltas[None, :] >= threshs[:, None]
+    # A delta only counts as bearish when it is not already bullish
+    bear_mask = ~bull_mask & (deltas[None, :] <= -threshs[:, None])
+
+    def side_stats(mask):
+        pct = mask.sum(axis=1) / len(deltas) * 100
+        # NaN-skipping mean per threshold, 0 when the side never triggers
+        has_ret = mask & ~np.isnan(returns)
+        n_ret = has_ret.sum(axis=1)
+        total = np.where(has_ret, returns, 0.0).sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = np.where(n_ret > 0, total / n_ret, np.nan)
+        return pct, np.where(mask.any(axis=1), mean * 100, 0)
+
+    bull_pcts, bull_rets = side_stats(bull_mask)
+    bear_pcts, bear_rets = side_stats(bear_mask)
+
+    for thresh, bull_pct, bear_pct, bull_ret, bear_ret in zip(threshs, bull_pcts, bear_pcts, bull_rets, bear_rets):
         spread = bull_ret - bear_ret
-
         print(f"  {thresh*100:>9.1f}% {bull_pct:>6.1f}% {bear_pct:>6.1f}% {bull_ret:>9.1f}% {bear_ret:>9.1f}% {spread:>9.1f}%")
 
 
@@ -413,15 +517,10 @@ def generate_recommendations(stable_df: pd.DataFrame, fred_data: Dict[str, pd.Da
 
     # Stablecoin recommendation
     if len(stable_df) > 21:
-        stable_df = stable_df.sort_values("date")
-        deltas = []
-        for i in range(21, len(stable_df)):
-            target_date = stable_df["date"].iloc[i]
-            delta = calculate_delta_at_date(stable_df.iloc[:i+1].copy(), target_date, 21, "supply")
-            if delta is not None:
-                deltas.append(delta)
-
-        if deltas:
+        _, deltas = sorted_rolling_deltas(stable_df, 21, "supply")
+        deltas = deltas[21:][~np.isnan(deltas[21:])]
+
+        if len(deltas) > 0:
             delta_series = pd.Series(deltas)
             p75 = delta_series.quantile(0.75)
             p25 = delta_series.quantile(0.25)
@@ -449,15 +548,10 @@ def generate_recommendations(stable_df: pd.DataFrame, fred_data: Dict[str, pd.Da
     ]:
         df = fred_data.get(key)
         if df is not None and len(df) > 28:
-            df = df.sort_values("date")
-            deltas = []
-            for i in range(28, len(df)):
-                target_date = df["date"].iloc[i]
-                delta = calculate_delta_at_date(df.iloc[:i+1].copy(), target_date, 28, "value")
-                if delta is not None:
-                    deltas.append(delta)
-
-            if deltas:
+            _, deltas = sorted_rolling_deltas(df, 28, "value")
+            deltas = deltas[28:][~np.isnan(deltas[28:])]
+
+            if len(deltas) > 0:
                 delta_series = pd.Series(deltas)
                 p10 = delta_series.quantile(0.10)
                 p90 = delta_series.quantile(0.90)
@@ -2,6 +2,7 @@
 SQLite caching for API data
 """
 
+import io
 import sqlite3
 import json
 import pandas as pd
@@ -13,6 +14,38 @@ import pickle
 from config import CACHE_TTL
 
 
+class _ParquetFrame:
+    """Pickle-friendly holder for a DataFrame stored as Parquet bytes."""
+
+    __slots__ = ("payload",)
+
+    def __init__(self, payload: bytes):
+        self.payload = payload
+
+
+def _pack(value: Any) -> Any:
+    """Replace DataFrames in a (nested dict) cache value with Parquet blobs."""
+    if isinstance(value, pd.DataFrame):
+        buf = io.BytesIO()
+        value.to_parquet(buf, compression="zstd")
+        return _ParquetFrame(buf.getvalue())
+    if isinstance(value, dict):
+        return {k: _pack(v) for k, v in value.items()}
+    return value
+
+
+def unpack_frames(value: Any) -> Any:
+    """
+    Inverse of _pack: rebuild DataFrames from their Parquet blobs. For readers
+    of cache.db outside CacheManager; values without blobs pass through.
+    """
+    if isinstance(value, _ParquetFrame):
+        return pd.read_parquet(io.BytesIO(value.payload))
+    if isinstance(value, dict):
+        return {k: unpack_frames(v) for k, v in value.items()}
+    return value
+
+
 class CacheManager:
     """Manages SQLite-based caching for API data."""
 
@@ -57,7 +90,7 @@ class CacheManager:
                 conn.commit()
                 return None
 
-            return pickle.loads(data_blob)
+            return unpack_frames(pickle.loads(data_blob))
 
     def set(self, key: str, data: Any, ttl: Optional[int] = None):
         """
@@ -67,7 +100,7 @@ class CacheManager:
         if ttl is None:
             ttl = 3600
 
-        data_blob = pickle.dumps(data)
+        data_blob = pickle.dumps(_pack(data))
 
         with sqlite3.connect(self.db_path) as conn:
             conn.execute("""
@@ -5,6 +5,8 @@ import pickle
 from pathlib import Path
 import pandas as pd
 
+from data.cache import unpack_frames
+
 db_path = Path(__file__).parent / "cache.db"
 
 with sqlite3.connect(db_path) as conn:
@@ -18,7 +20,7 @@ with sqlite3.connect(db_path) as conn:
         print(f"{'='*60}")
 
         try:
-            data = pickle.loads(data_blob)
+            data = unpack_frames(pickle.loads(data_blob))
 
             if isinstance(data, dict):
                 print(f"Type: dict with keys: {list(data.keys())}")